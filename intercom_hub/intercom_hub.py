@@ -16,9 +16,17 @@ Entities created:
 import os
 import sys
 import json
+import wave
+import shutil
+import signal
+import traceback
+import contextlib
+import ctypes
+import errno
 import socket
 import struct
 import hashlib
+import mimetypes
 import threading
 import concurrent.futures
 import subprocess
@@ -30,8 +38,10 @@ import urllib.error
 import re
 import html
 import base64
+from fractions import Fraction
 from pathlib import Path
-from typing import Optional, Dict, Any
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, Tuple
 import paho.mqtt.client as mqtt
 
 # Setup logging
@@ -62,10 +72,15 @@ MAX_URL_LENGTH = 2048
 # Allowed characters for client IDs and room names (alphanumeric, spaces, underscores, dashes)
 SAFE_NAME_PATTERN = re.compile(r'^[\w\s\-\.]+$', re.UNICODE)
 
+# Names that already passed validation: (raw value, max length) -> sanitized.
+# The same few room/client names arrive on every call/identify/PTT message.
+_valid_names: Dict[Tuple[str, int], str] = {}
+_VALID_NAMES_MAX = 256
+
 # URL whitelist patterns for audio fetch (restrict to safe sources)
 ALLOWED_URL_PATTERNS = [
-    r'^https?://[a-zA-Z0-9\.\-]+/.*\.(mp3|wav|ogg|m4a)$',  # Audio file URLs
-    r'^https?://(localhost|127\.0\.0\.1|10\.0\.0\.\d+|homeassistant|supervisor)/api/.*$',  # HA API endpoints only
+    re.compile(r'^https?://[a-zA-Z0-9\.\-]+/.*\.(mp3|wav|ogg|m4a)$', re.IGNORECASE),  # Audio file URLs
+    re.compile(r'^https?://(localhost|127\.0\.0\.1|10\.0\.0\.\d+|homeassistant|supervisor)/api/.*$', re.IGNORECASE),  # HA API endpoints only
 ]
 
 
@@ -73,32 +88,40 @@ def sanitize_string(value: str, max_length: int = 64) -> str:
     """Sanitize a string by removing dangerous characters and limiting length."""
     if not isinstance(value, str):
         return ""
-    # Remove control characters and null bytes
-    value = ''.join(c for c in value if c.isprintable() or c in ' \t')
+    # Remove control characters and null bytes (skip the per-char scan in the
+    # common case where there are none)
+    if not value.isprintable():
+        value = ''.join(c for c in value if c.isprintable() or c in ' \t')
     # Trim to max length
     return value[:max_length].strip()
 
 
-def sanitize_client_id(client_id: str) -> Optional[str]:
-    """Sanitize and validate a client ID."""
-    if not client_id or not isinstance(client_id, str):
+def _sanitize_name(value: str, max_length: int, kind: str) -> Optional[str]:
+    """Sanitize and validate a name, reusing earlier results for valid names."""
+    if not value or not isinstance(value, str):
         return None
-    client_id = sanitize_string(client_id, MAX_CLIENT_ID_LENGTH)
-    if not client_id or not SAFE_NAME_PATTERN.match(client_id):
-        log.warning(f"Invalid client_id rejected: {repr(client_id[:20])}")
+    key = (value, max_length)
+    name = _valid_names.get(key)
+    if name is not None:
+        return name
+    name = sanitize_string(value, max_length)
+    if not name or not SAFE_NAME_PATTERN.match(name):
+        log.warning(f"Invalid {kind} rejected: {repr(name[:20])}")
         return None
-    return client_id
+    if len(_valid_names) >= _VALID_NAMES_MAX:
+        _valid_names.clear()
+    _valid_names[key] = name
+    return name
+
+
+def sanitize_client_id(client_id: str) -> Optional[str]:
+    """Sanitize and validate a client ID."""
+    return _sanitize_name(client_id, MAX_CLIENT_ID_LENGTH, "client_id")
 
 
 def sanitize_room_name(room: str) -> Optional[str]:
     """Sanitize and validate a room name."""
-    if not room or not isinstance(room, str):
-        return None
-    room = sanitize_string(room, MAX_ROOM_NAME_LENGTH)
-    if not room or not SAFE_NAME_PATTERN.match(room):
-        log.warning(f"Invalid room name rejected: {repr(room[:20])}")
-        return None
-    return room
+    return _sanitize_name(room, MAX_ROOM_NAME_LENGTH, "room name")
 
 
 def validate_ip_address(ip: str) -> bool:
@@ -122,7 +145,7 @@ def validate_url(url: str) -> bool:
     if len(url) > MAX_URL_LENGTH:
         return False
     for pattern in ALLOWED_URL_PATTERNS:
-        if re.match(pattern, url, re.IGNORECASE):
+        if pattern.match(url):
             return True
     return False
 
@@ -149,7 +172,7 @@ def html_escape(text: str) -> str:
 VERSION = "2.5.7"  # Add AudioCaptureBuffer, /api/audio_capture, TX stats in audio_stats
 
 try:
-    from aiohttp import web
+    from aiohttp import web, WSCloseCode
 except ImportError:
     log.warning("aiohttp not available - web PTT disabled")
     web = None
@@ -160,6 +183,62 @@ except ImportError:
     log.warning("opuslib not available")
     opuslib = None
 
+try:
+    from wyoming.audio import AudioChunk, AudioStop
+    from wyoming.tts import Synthesize
+    from wyoming.event import async_read_event, async_write_event
+except ImportError:
+    log.warning("wyoming not available - TTS disabled")
+    Synthesize = None
+
+try:
+    import av  # Optional: in-process FFmpeg bindings for media decode
+except ImportError:
+    av = None  # Falls back to an ffmpeg subprocess
+
+try:
+    import orjson  # Optional: faster JSON encode/decode
+except ImportError:
+    orjson = None  # Falls back to stdlib json
+
+try:
+    import uvloop  # Optional: libuv-based event loop for the web server
+except ImportError:
+    uvloop = None  # Falls back to the default asyncio loop
+
+
+def _json_dumps(obj) -> str:
+    """Serialize obj to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes (orjson when available).
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+    catching the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Web state messages are sent on every PTT edge - serialize the common ones once
+_STATE_MESSAGES = {
+    status: _json_dumps({'type': 'state', 'status': status})
+    for status in ("idle", "transmitting", "receiving")
+}
+
+
+def _state_message(status):
+    """Return the serialized web 'state' message for a status."""
+    message = _STATE_MESSAGES.get(status)
+    if message is None:
+        message = _json_dumps({'type': 'state', 'status': status})
+    return message
+
 # Configuration from environment
 MQTT_HOST = os.environ.get('MQTT_HOST', 'core-mosquitto')
 MQTT_PORT = int(os.environ.get('MQTT_PORT', '1883'))
@@ -171,27 +250,39 @@ MULTICAST_PORT = int(os.environ.get('MULTICAST_PORT', '5005'))
 PIPER_HOST = os.environ.get('PIPER_HOST', '') or 'core-piper'
 _piper_port = os.environ.get('PIPER_PORT', '') or '10200'
 PIPER_PORT = int(_piper_port) if _piper_port.isdigit() else 10200
+# CELT-only Opus for web PTT: lower algorithmic delay, needs >=32kbps for speech
+WEB_PTT_LOW_DELAY = os.environ.get('WEB_PTT_LOW_DELAY', 'true').lower() != 'false'
 
 # Audio settings (must match ESP32 firmware)
 SAMPLE_RATE = 16000
 CHANNELS = 1
 FRAME_DURATION_MS = 20
 FRAME_SIZE = SAMPLE_RATE * FRAME_DURATION_MS // 1000  # 320 samples
+SILENCE_PCM = bytes(FRAME_SIZE * 2)  # One 20ms frame of int16 silence
 OPUS_BITRATE = 32000  # Match ESP32 for consistent quality
 
 # Protocol v2.5.0+: packet header now 13 bytes (8 device_id + 4 seq + 1 priority)
 PACKET_HEADER_SIZE = 13  # Updated from 12 to include priority byte
+# seq + priority fields following the 8-byte device ID, compiled once
+PACKET_SEQ_PRIORITY = struct.Struct('>IB')
+PACKET_SEQ = struct.Struct('>I')
+MAX_OPUS_PACKET_SIZE = 1275  # RFC 6716 upper bound for a single Opus frame
 # Priority levels (must match firmware protocol.h)
 PRIORITY_NORMAL = 0
 PRIORITY_HIGH = 1
 PRIORITY_EMERGENCY = 2
+# Priority select / web client names <-> levels
+PRIORITY_MAP = {"Normal": PRIORITY_NORMAL, "High": PRIORITY_HIGH, "Emergency": PRIORITY_EMERGENCY}
+PRIORITY_NAMES = {level: name for name, level in PRIORITY_MAP.items()}
 
 # Broadcast sync: delay added to multicast packets so all receivers play at the same time
 
 # Generate unique device ID from hostname
 def generate_device_id():
     hostname = socket.gethostname()
-    h = hashlib.md5(hostname.encode()).digest()
+    # MD5 is kept so existing installs keep their IDs (UNIQUE_ID and the HA
+    # entity IDs derive from it); it is an identifier, not a security hash
+    h = hashlib.md5(hostname.encode(), usedforsecurity=False).digest()
     return h[:8]
 
 DEVICE_ID = generate_device_id()
@@ -225,6 +316,31 @@ DND_CMD_TOPIC = f"{BASE_TOPIC}/dnd/set"
 # Device discovery topic
 DEVICE_INFO_TOPIC = "intercom/devices/+/info"
 
+# HA device block shared by every discovery config (static for the process lifetime)
+HUB_DEVICE_INFO = {
+    "identifiers": [DEVICE_ID_STR],
+    "name": DEVICE_NAME,
+    "model": "Intercom Hub",
+    "manufacturer": "guywithacomputer",
+    "sw_version": VERSION
+}
+
+# Target select discovery config; only "options" changes as devices come and go
+TARGET_SELECT_CONFIG_TOPIC = f"homeassistant/select/{UNIQUE_ID}_target/config"
+_TARGET_SELECT_CONFIG_TEMPLATE = {
+    "name": "Target",
+    "unique_id": f"{UNIQUE_ID}_target",
+    "default_entity_id": f"select.{UNIQUE_ID}_target",
+    "device": HUB_DEVICE_INFO,
+    "state_topic": TARGET_STATE_TOPIC,
+    "command_topic": TARGET_CMD_TOPIC,
+    "availability_topic": AVAILABILITY_TOPIC,
+    "icon": "mdi:target",
+    "has_entity_name": True
+}
+# Template serialized once; each update splices in just the options list
+_TARGET_SELECT_CONFIG_PREFIX = _json_dumps(_TARGET_SELECT_CONFIG_TEMPLATE)[:-1] + ',"options":'
+
 # State
 current_volume = 100
 is_muted = False
@@ -232,6 +348,7 @@ current_state = "idle"
 current_target = "All Rooms"  # Default target
 sequence_num = 0
 mqtt_client = None
+_mqtt_connected = False  # Tracked from on_connect/on_disconnect (cheaper than is_connected())
 tx_socket = None
 rx_socket = None
 last_rx_time = 0
@@ -245,6 +362,10 @@ tx_lock = threading.Lock()
 # current_state, web_ptt_active, last_web_ptt_frame_time (used in is_channel_busy)
 state_lock = threading.Lock()
 
+# Notified when the state returns to idle, waking wait_for_channel().
+# Never acquire it while holding state_lock (waiters take it first).
+channel_free = threading.Condition()
+
 # Priority state
 current_tx_priority = PRIORITY_NORMAL  # Hub's own TX priority
 hub_dnd_enabled = False               # Hub DND: only EMERGENCY plays when on
@@ -252,15 +373,36 @@ current_rx_priority = PRIORITY_NORMAL  # Priority of whoever is currently transm
 
 # Discovered devices: {unique_id: {"room": "Kitchen", "ip": "192.1.8.4.50"}}
 discovered_devices = {}
+# Indexes derived from discovered_devices, rebuilt by _rebuild_device_indexes()
+# whenever a device appears, moves, or goes away (not on heartbeats)
+_target_rooms = []  # Sorted distinct rooms (rebuilt only when devices change)
+_room_to_ip = {}  # room -> IP of the first device in that room
+_mobile_rooms = frozenset()  # Rooms that are mobile devices (get push notifications)
+_last_published_options = None  # Options tuple last sent in the target select discovery config
 
 # Web PTT state
 web_clients = set()  # Connected WebSocket clients
+_clients_snapshot = ()  # Immutable copy of web_clients, replaced whenever membership changes
 web_client_ids = {}  # Map WebSocket -> client_id (e.g., "Brians_Phone", "Web_A1B2")
+web_clients_by_id = {}  # Inverse of web_client_ids: client_id -> set of WebSockets
 web_client_topics = {}  # Map client_id -> {"info": topic, "status": topic}
+web_client_queues = {}  # Map WebSocket -> (outbound asyncio.Queue, writer task)
+WEB_SEND_TIMEOUT = 5.0  # Seconds before a stalled web client send is abandoned
+WEB_CLIENT_QUEUE_SIZE = 50  # Outbound messages buffered per client (~1s of audio)
+# One-byte priority prefixes for binary audio frames ([priority][PCM...]),
+# indexed by priority so the per-frame path doesn't build a new bytes object
+_PRIORITY_PREFIXES = tuple(bytes((p,)) for p in range(256))
+_BROADCAST_NAMES = frozenset(('all', 'all rooms'))  # Lowercased web PTT "everyone" targets
 web_ptt_active = False  # Is a web client transmitting
+_last_web_state = None  # State last broadcast to every web client (None = unknown/mixed)
 last_web_ptt_frame_time = 0.0  # monotonic timestamp of last Web PTT audio frame
 WEB_PTT_IDLE_TIMEOUT = 5.0  # seconds with no audio frames before auto-resetting stuck PTT state
-web_ptt_encoder = None  # Opus encoder for web PTT
+web_ptt_encoder = None  # Opus encoder for the active web PTT session (None when idle)
+_web_encoder = None  # Reusable encoder behind web_ptt_encoder, reset per session
+# Web PTT frames are encoded and sent here, off the event loop.  One worker
+# keeps frames in order, and every use of the web encoder goes through it so
+# the encoder is only ever touched by one thread.
+_encode_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="opus-enc")
 web_event_loop = None  # Event loop for async web operations
 web_tx_lock = None  # Async lock to serialize web PTT transmissions (created at runtime)
 INGRESS_PORT = int(os.environ.get('INGRESS_PORT', '8099'))
@@ -272,6 +414,7 @@ BUNDLED_CHIMES_PATH = Path(__file__).parent / 'chimes'
 
 # Mobile devices config and topics
 MOBILE_DEVICES = []  # List of {"name": "...", "notify_service": "..."}
+_mobile_stale_topics = []  # (info_topic, status_topic) of legacy web-client entries per mobile device
 MOBILE_CALL_TOPIC = "intercom/call"  # Publish call notifications here
 
 # Track recent incoming calls for auto-select in Web PTT
@@ -360,14 +503,34 @@ class AudioRxStats:
     non-async background thread) while the HTTP endpoint queries it from the
     asyncio event loop — hence the lock.
 
-    The lock is held only for dict lookups and small in-place mutations, so
-    contention on the hot RX path is minimal.
+    Packets are accumulated without the lock by the receive thread and
+    applied under the lock in batches (every FLUSH_PACKETS packets or
+    FLUSH_INTERVAL seconds), so queries may lag the socket by up to
+    FLUSH_INTERVAL.
+
+    Times are stored on the monotonic clock, so ordering and recency checks
+    survive wall-clock steps (NTP); they become unix timestamps on output.
     """
 
+    FLUSH_PACKETS = 16
+    FLUSH_INTERVAL = 0.1  # seconds
+
     def __init__(self):
-        # sender_id_hex -> stats dict
-        self._data: Dict[str, Dict[str, Any]] = {}
+        # sender_id_hex -> stats dict (first_rx/last_rx are time.monotonic()
+        # values), ordered by last_rx (most recent last):
+        # flush() moves each sender to the end, so recency filters can stop
+        # at the first entry that is too old instead of scanning every sender.
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._lock = threading.Lock()
+        # Receive-thread-only batch: sender_id_hex ->
+        # [first_rx, last_rx, packet_count, seq_min, seq_max, priority]
+        self._pending: Dict[str, list] = {}
+        self._pending_packets = 0
+        self._last_flush = 0.0
+        # Bumped by clear-all; a batch started before the clear is discarded
+        # at flush instead of resurrecting the senders that were just cleared
+        self._generation = 0
+        self._pending_generation = 0
 
     def record(self, sender_id_hex: str, sequence: int, priority: int) -> None:
         """Record one received packet.  Called from receive_thread() hot path.
@@ -377,26 +540,60 @@ class AudioRxStats:
             sequence:       32-bit sequence number from packet header.
             priority:       Priority byte (0=Normal, 1=High, 2=Emergency).
         """
-        now = time.time()
+        now = time.monotonic()
+        if not self._pending:
+            self._pending_generation = self._generation
+        pending = self._pending.get(sender_id_hex)
+        if pending is None:
+            self._pending[sender_id_hex] = [now, now, 1, sequence, sequence, priority]
+        else:
+            pending[1] = now
+            pending[2] += 1
+            if sequence < pending[3]:
+                pending[3] = sequence
+            if sequence > pending[4]:
+                pending[4] = sequence
+            pending[5] = priority
+
+        self._pending_packets += 1
+        if self._pending_packets >= self.FLUSH_PACKETS or now - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply batched packets under the lock.  Receive thread only."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = {}
+        self._pending_packets = 0
+        self._last_flush = time.monotonic()
+
         with self._lock:
-            entry = self._data.get(sender_id_hex)
-            if entry is None:
-                self._data[sender_id_hex] = {
-                    "first_rx": now,
-                    "last_rx": now,
-                    "packet_count": 1,
-                    "seq_min": sequence,
-                    "seq_max": sequence,
-                    "priority": priority,
-                }
-            else:
-                entry["last_rx"] = now
-                entry["packet_count"] += 1
-                if sequence < entry["seq_min"]:
-                    entry["seq_min"] = sequence
-                if sequence > entry["seq_max"]:
-                    entry["seq_max"] = sequence
-                entry["priority"] = priority
+            if self._pending_generation != self._generation:
+                return  # Stats were cleared after this batch started
+            # Oldest first, so each move_to_end keeps _data ordered by last_rx
+            for sid, (first_rx, last_rx, count, seq_min, seq_max, priority) in sorted(
+                pending.items(), key=lambda item: item[1][1]
+            ):
+                entry = self._data.get(sid)
+                if entry is None:
+                    self._data[sid] = {
+                        "first_rx": first_rx,
+                        "last_rx": last_rx,
+                        "packet_count": count,
+                        "seq_min": seq_min,
+                        "seq_max": seq_max,
+                        "priority": priority,
+                    }
+                else:
+                    self._data.move_to_end(sid)
+                    entry["last_rx"] = last_rx
+                    entry["packet_count"] += count
+                    if seq_min < entry["seq_min"]:
+                        entry["seq_min"] = seq_min
+                    if seq_max > entry["seq_max"]:
+                        entry["seq_max"] = seq_max
+                    entry["priority"] = priority
 
     def get_stats(
         self,
@@ -417,32 +614,37 @@ class AudioRxStats:
             ``age_seconds`` and ``duration_seconds`` computed fields.
             Returns an empty dict if no matching entries.
         """
-        now = time.time()
-        cutoff = (now - window) if window > 0 else 0.0
-
-        with self._lock:
-            # Deep-copy each entry so the caller can never alias live data.
-            snapshot = {k: dict(v) for k, v in self._data.items()}
+        now = time.monotonic()
+        # Stored times are monotonic; this maps them to unix time for output
+        to_wall = time.time() - now
+        # Window and since both bound last_rx from below - fold into one threshold
+        cutoff = (now - window) if window > 0 else float("-inf")
+        if since is not None and since - to_wall > cutoff:
+            cutoff = since - to_wall
 
         result: Dict[str, Dict[str, Any]] = {}
-        for sid, entry in snapshot.items():
-            if sender is not None and sid != sender:
-                continue
-            last_rx = entry["last_rx"]
-            if window > 0 and last_rx < cutoff:
-                continue
-            if since is not None and last_rx < since:
-                continue
-            result[sid] = {
-                "first_rx": entry["first_rx"],
-                "last_rx": last_rx,
-                "packet_count": entry["packet_count"],
-                "seq_min": entry["seq_min"],
-                "seq_max": entry["seq_max"],
-                "priority": entry["priority"],
-                "age_seconds": round(now - last_rx, 3),
-                "duration_seconds": round(last_rx - entry["first_rx"], 3),
-            }
+        with self._lock:
+            if sender is not None:
+                entry = self._data.get(sender)
+                items = ((sender, entry),) if entry is not None else ()
+            else:
+                items = reversed(self._data.items())  # Newest first
+            # Single pass: filter and build fresh output dicts (never aliasing
+            # live data) directly, without an intermediate snapshot copy.
+            for sid, entry in items:
+                last_rx = entry["last_rx"]
+                if last_rx < cutoff:
+                    break  # Everything after this is older still
+                result[sid] = {
+                    "first_rx": entry["first_rx"] + to_wall,
+                    "last_rx": last_rx + to_wall,
+                    "packet_count": entry["packet_count"],
+                    "seq_min": entry["seq_min"],
+                    "seq_max": entry["seq_max"],
+                    "priority": entry["priority"],
+                    "age_seconds": round(now - last_rx, 3),
+                    "duration_seconds": round(last_rx - entry["first_rx"], 3),
+                }
         return result
 
     def clear(self, older_than: float = 300.0) -> int:
@@ -455,16 +657,22 @@ class AudioRxStats:
         Returns:
             Number of entries removed.
         """
-        cutoff = time.time() - older_than
+        cutoff = time.monotonic() - older_than
         with self._lock:
             if older_than <= 0:
                 count = len(self._data)
                 self._data.clear()
+                self._generation += 1
                 return count
-            to_remove = [sid for sid, e in self._data.items() if e["last_rx"] < cutoff]
-            for sid in to_remove:
-                del self._data[sid]
-            return len(to_remove)
+            # Oldest entries are at the front
+            count = 0
+            while self._data:
+                entry = next(iter(self._data.values()))
+                if entry["last_rx"] >= cutoff:
+                    break
+                self._data.popitem(last=False)
+                count += 1
+            return count
 
 
 audio_rx_stats = AudioRxStats()
@@ -541,6 +749,10 @@ audio_capture = AudioCaptureBuffer()
 # Chime state: pre-encoded chime frames, keyed by chime name (e.g. "doorbell")
 # Loaded at startup; each entry is a list of Opus-encoded bytes objects.
 loaded_chimes: Dict[str, list] = {}
+# Derived from loaded_chimes by refresh_chime_catalog() whenever it changes:
+# sorted names, and sorted {name, frames, duration} entries for /api/chimes
+_chime_options: list = []
+_chime_list: list = []
 
 # Selected chime name (controlled via HA select entity)
 current_chime = "doorbell"
@@ -579,7 +791,7 @@ def get_web_client_topics(client_id):
 
 def publish_web_client_online(client_id):
     """Publish a web client as a discoverable target via MQTT."""
-    if not mqtt_client or not mqtt_client.is_connected():
+    if not _mqtt_connected:
         return
 
     topics = get_web_client_topics(client_id)
@@ -598,7 +810,7 @@ def publish_web_client_online(client_id):
 
 def publish_web_client_offline(client_id):
     """Mark a web client as offline via MQTT."""
-    if not mqtt_client or not mqtt_client.is_connected():
+    if not _mqtt_connected:
         return
 
     if client_id not in web_client_topics:
@@ -733,6 +945,20 @@ def load_mobile_devices():
     # Mobile devices are discovered for notifications only — NOT published
     # as selectable audio targets (sending audio to a phone is useless).
 
+    # Topics cleared on every MQTT (re)connect - derived here so reconnects don't redo it
+    global _mobile_stale_topics
+    stale = []
+    for mobile in MOBILE_DEVICES:
+        safe_id = mobile["name"].replace(' ', '_').replace('/', '_').lower()
+        stale.append((
+            f"intercom/devices/{UNIQUE_ID}_web_{safe_id}/info",
+            f"intercom/{UNIQUE_ID}_web_{safe_id}/status",
+        ))
+    _mobile_stale_topics = stale
+
+    # Mobile-ness of already-discovered rooms may have changed
+    _refresh_device_indexes()
+
 
 def mobile_refresh_thread():
     """Background thread to periodically refresh mobile device list."""
@@ -754,7 +980,7 @@ def mobile_refresh_thread():
 
 def publish_mobile_devices():
     """Publish mobile devices as discoverable targets."""
-    if not mqtt_client or not mqtt_client.is_connected():
+    if not _mqtt_connected:
         return
 
     hub_ip = get_local_ip()  # Use hub's IP so ESP32 can unicast to us
@@ -845,15 +1071,66 @@ def send_mobile_notification(device_name, caller_name):
         log.warning(f"Failed to send notification to {device_name}: {e}")
 
 
+# Mobile notifications are blocking HTTP calls to HA (up to 10s each) - run
+# them here so callers never wait and a call-all fans out concurrently
+_notify_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+
+
+def queue_mobile_notification(device_name, caller_name):
+    """Send a mobile notification in the background (any thread)."""
+    _notify_executor.submit(send_mobile_notification, device_name, caller_name)
+
+
+def publish_call(target, caller, chime):
+    """Publish a hub-originated call on MOBILE_CALL_TOPIC (ESP32s listen)."""
+    mqtt_client.publish(MOBILE_CALL_TOPIC, _json_dumps({
+        "target": target,
+        "caller": caller,
+        "source": "hub",
+        "chime": chime
+    }))
+
+
 def is_mobile_device(room_name):
     """Check if a room name is a mobile device."""
     return any(dev["name"] == room_name for dev in MOBILE_DEVICES)
 
 
+# Kernel buffer size requested for the audio sockets.  The kernel charges
+# ~2KB of skb overhead per small datagram, so this holds several seconds of
+# audio - enough to ride out GC pauses or a slow decode in receive_thread.
+UDP_SOCKET_BUFFER_SIZE = 1024 * 1024
+# Linux-only options that bypass net.core.{r,w}mem_max (need CAP_NET_ADMIN).
+# Older Pythons don't export them; the numbers mean something else elsewhere,
+# so the fallbacks are only used on Linux.
+if sys.platform.startswith('linux'):
+    _SO_SNDBUFFORCE = getattr(socket, 'SO_SNDBUFFORCE', 32)
+    _SO_RCVBUFFORCE = getattr(socket, 'SO_RCVBUFFORCE', 33)
+else:
+    _SO_SNDBUFFORCE = _SO_RCVBUFFORCE = None
+
+
+def _set_socket_buffer(sock, option, force_option, label):
+    """Request UDP_SOCKET_BUFFER_SIZE for a socket buffer and log what we got."""
+    forced = False
+    if force_option is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, force_option, UDP_SOCKET_BUFFER_SIZE)
+            forced = True
+        except OSError:
+            pass  # No CAP_NET_ADMIN
+    if not forced:
+        # The kernel caps this at net.core.{r,w}mem_max
+        sock.setsockopt(socket.SOL_SOCKET, option, UDP_SOCKET_BUFFER_SIZE)
+    effective = sock.getsockopt(socket.SOL_SOCKET, option)
+    log.info(f"UDP {label} buffer: {effective // 1024}KB")
+
+
 def create_tx_socket():
     """Create UDP socket for sending multicast."""
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    _set_socket_buffer(sock, socket.SO_SNDBUF, _SO_SNDBUFFORCE, "send")
     sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
     # Disable multicast loopback - prevent receiving our own packets
     sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 0)
@@ -868,8 +1145,8 @@ def create_rx_socket():
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
-    # Increase receive buffer for burst absorption (64KB holds ~325 frames)
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+    # Increase receive buffer for burst absorption
+    _set_socket_buffer(sock, socket.SO_RCVBUF, _SO_RCVBUFFORCE, "receive")
 
     # Bind to the multicast port
     sock.bind(('', MULTICAST_PORT))
@@ -884,6 +1161,33 @@ def create_rx_socket():
     return sock
 
 
+_tx_buffers = threading.local()
+
+
+def _build_packet(seq: int, priority: int, opus_data) -> memoryview:
+    """Assemble header + payload in a reusable per-thread buffer.
+
+    The device ID is written once when the buffer is created; each call
+    only packs seq/priority and copies the Opus bytes in, so the send loops
+    do no per-frame allocation.  The returned view is only valid until the
+    next call on the same thread.
+    """
+    buf = getattr(_tx_buffers, "buf", None)
+    if buf is None:
+        buf = bytearray(PACKET_HEADER_SIZE + MAX_OPUS_PACKET_SIZE)
+        buf[:len(DEVICE_ID)] = DEVICE_ID
+        _tx_buffers.buf = buf
+
+    end = PACKET_HEADER_SIZE + len(opus_data)
+    if end > len(buf):
+        # Oversized payload (never produced by our encoders) - don't grow the shared buffer
+        return memoryview(DEVICE_ID + PACKET_SEQ_PRIORITY.pack(seq, priority) + bytes(opus_data))
+
+    PACKET_SEQ_PRIORITY.pack_into(buf, len(DEVICE_ID), seq, priority)
+    buf[PACKET_HEADER_SIZE:end] = opus_data
+    return memoryview(buf)[:end]
+
+
 def send_audio_packet(opus_data, target_ip=None, priority=None):
     """Send an audio packet via multicast or unicast.
 
@@ -901,9 +1205,8 @@ def send_audio_packet(opus_data, target_ip=None, priority=None):
         priority = current_tx_priority
 
     # Header: device_id (8) + sequence (4) + priority (1) = 13 bytes
-    header = DEVICE_ID + struct.pack('>IB', sequence_num, priority)
+    packet = _build_packet(sequence_num, priority, opus_data)
     sequence_num += 1
-    packet = header + opus_data
 
     try:
         if target_ip:
@@ -923,15 +1226,13 @@ def send_audio_packet(opus_data, target_ip=None, priority=None):
 
 def get_target_ip():
     """Get the IP address for the current target, or None for multicast."""
-    global current_target, discovered_devices
-
     if current_target == "All Rooms":
         return None
 
     # Find device by room name
-    for device_id, info in discovered_devices.items():
-        if info.get("room") == current_target:
-            return info.get("ip")
+    ip = _room_to_ip.get(current_target)
+    if ip:
+        return ip
 
     # Target not found, fall back to multicast
     log.warning(f"Target '{current_target}' not found, using multicast")
@@ -1030,13 +1331,20 @@ def wait_for_channel(timeout=None, our_priority=None):
 
     log.debug("Channel busy - waiting for it to be free...")
     start = time.time()
-
-    while time.time() - start < timeout:
-        if not is_channel_busy(our_priority):
-            waited = time.time() - start
-            log.debug(f"Channel free after {waited:.1f}s")
-            return True
-        time.sleep(0.1)
+    deadline = start + timeout
+
+    with channel_free:
+        while True:
+            if not is_channel_busy(our_priority):
+                waited = time.time() - start
+                log.debug(f"Channel free after {waited:.1f}s")
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            # Woken by publish_state("idle"); the cap is a safety net for
+            # paths that free the channel without publishing
+            channel_free.wait(min(remaining, 0.5))
 
     log.warning(f"Channel busy timeout ({timeout}s) - sending anyway")
     return False
@@ -1046,7 +1354,10 @@ def receive_thread():
     """Thread to receive multicast audio from ESP32 devices."""
     global current_state, last_rx_time, rx_socket, current_audio_sender, current_rx_priority
 
-    log.debug("Receive thread started")
+    if _set_realtime_priority(RX_RT_PRIORITY):
+        log.debug("Receive thread started (SCHED_FIFO)")
+    else:
+        log.debug("Receive thread started")
 
     # Create Opus decoder for forwarding to web clients
     rx_decoder = None
@@ -1061,12 +1372,18 @@ def receive_thread():
     rx_last_seq = None
     rx_last_sender = None
 
+    # Packets land in one reusable buffer; only the Opus payload of packets
+    # we keep is copied out (opuslib's ctypes binding needs bytes)
+    rx_buf = bytearray(PACKET_HEADER_SIZE + MAX_OPUS_PACKET_SIZE)
+    rx_view = memoryview(rx_buf)
+
     while True:
         try:
-            data, addr = rx_socket.recvfrom(1024)
+            nbytes, addr = rx_socket.recvfrom_into(rx_buf)
 
-            if len(data) < PACKET_HEADER_SIZE:  # 13 bytes: 8 byte ID + 4 byte seq + 1 byte priority
+            if nbytes < PACKET_HEADER_SIZE:  # 13 bytes: 8 byte ID + 4 byte seq + 1 byte priority
                 continue
+            data = rx_view[:nbytes]
 
             # Parse packet
             sender_id = data[:8]
@@ -1076,7 +1393,7 @@ def receive_thread():
                 continue
 
             sender_id_str = sender_id.hex()
-            sequence = struct.unpack('>I', data[8:12])[0]
+            sequence = PACKET_SEQ.unpack_from(data, 8)[0]
 
             # Track multicast metrics
             mcast_metrics.record_rx(sender_id_str, sequence)
@@ -1088,10 +1405,10 @@ def receive_thread():
                 incoming_priority = data[12]
                 if incoming_priority > PRIORITY_EMERGENCY:
                     incoming_priority = PRIORITY_NORMAL  # Clamp unknown values
-                opus_frame = data[PACKET_HEADER_SIZE:]  # 13-byte header
+                opus_frame = bytes(data[PACKET_HEADER_SIZE:])  # 13-byte header
             else:
                 incoming_priority = PRIORITY_NORMAL
-                opus_frame = data[12:]  # Old 12-byte header (legacy)
+                opus_frame = bytes(data[12:])  # Old 12-byte header (legacy)
 
             # Record per-sender RX stats (before DND filter — counts all arriving packets)
             audio_rx_stats.record(sender_id_str, sequence, incoming_priority)
@@ -1121,9 +1438,9 @@ def receive_thread():
                 last_rx_time = now
 
             if state_changed:
-                # Publish MQTT state (for HA integration) - outside lock to avoid blocking
-                if mqtt_client and mqtt_client.is_connected():
-                    mqtt_client.publish(STATE_TOPIC, "receiving", retain=True)
+                # Publish MQTT state (for HA integration) - outside lock to avoid blocking.
+                # Goes through the coalescer so its last-sent tracking sees it
+                schedule_publish(STATE_TOPIC, "receiving")
 
                 # Notify web clients - targeted if specific target, broadcast if "all rooms"
                 is_broadcast = not target or target.lower() in ("all", "all rooms", "unknown")
@@ -1182,6 +1499,9 @@ def receive_thread():
                     pass  # Ignore decode errors
 
         except socket.timeout:
+            # Quiet socket: apply any batched RX stats now
+            audio_rx_stats.flush()
+
             # Check if we should go back to idle
             with state_lock:
                 should_go_idle = (current_state == "receiving" and
@@ -1202,12 +1522,11 @@ def text_to_speech(text):
     """Convert text to PCM audio using Wyoming/Piper TTS."""
     log.info(f"TTS: {text}")
 
-    try:
-        import asyncio
-        from wyoming.audio import AudioChunk, AudioStop
-        from wyoming.tts import Synthesize
-        from wyoming.event import Event, async_read_event, async_write_event
+    if Synthesize is None:
+        log.error("TTS unavailable: wyoming is not installed")
+        return None
 
+    try:
         async def do_tts():
             audio_data = b''
             sample_rate = 22050  # Piper default
@@ -1261,6 +1580,14 @@ def text_to_speech(text):
         log.info(f"TTS raw: {len(audio_data)} bytes at {sample_rate}Hz ({len(audio_data)//2} samples, {len(audio_data)/2/sample_rate:.2f}s)")
 
         # Convert to our target format (16kHz mono 16-bit)
+        if sample_rate != SAMPLE_RATE and av is not None:
+            try:
+                resampled = _resample_pcm_with_pyav(audio_data, sample_rate)
+                log.info(f"TTS resampled: {len(resampled)} bytes at {SAMPLE_RATE}Hz ({len(resampled)//2} samples, {len(resampled)/2/SAMPLE_RATE:.2f}s)")
+                return resampled
+            except Exception as e:
+                log.warning(f"PyAV resample failed, falling back to ffmpeg: {e}")
+
         if sample_rate != SAMPLE_RATE:
             cmd = [
                 'ffmpeg', '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
@@ -1284,15 +1611,89 @@ def text_to_speech(text):
         return None
     except Exception as e:
         log.error(f"TTS error: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
 
+def _pyav_frame_pcm(frame) -> bytes:
+    """Raw s16 mono samples of a PyAV frame (planes may be padded)."""
+    return bytes(frame.planes[0])[:frame.samples * 2]
+
+
+def _resample_pcm_with_pyav(pcm: bytes, sample_rate: int) -> bytes:
+    """Resample mono 16-bit PCM to SAMPLE_RATE in-process with PyAV.
+
+    Avoids forking ffmpeg and piping the whole clip through it twice.
+    """
+    samples = len(pcm) // 2
+    frame = av.AudioFrame(format='s16', layout='mono', samples=samples)
+    frame.planes[0].update(pcm[:samples * 2])
+    frame.sample_rate = sample_rate
+    # Decoded frames carry timing; a hand-built one needs it for the filter graph
+    frame.pts = 0
+    frame.time_base = Fraction(1, sample_rate)
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=SAMPLE_RATE)
+    chunks = [_pyav_frame_pcm(out) for out in resampler.resample(frame)]
+    # Flush the resampler's internal FIFO so the tail isn't lost
+    chunks.extend(_pyav_frame_pcm(out) for out in resampler.resample(None))
+    return b''.join(chunks)
+
+
+# Bounds for media decode: the ffmpeg subprocess is killed after
+# MEDIA_DECODE_TIMEOUT, and PyAV decode gets the same wall-clock budget plus
+# a cap on decoded audio so a live stream can't grow PCM without limit.
+MEDIA_DECODE_TIMEOUT = 30.0  # seconds
+MEDIA_MAX_PCM_BYTES = 300 * SAMPLE_RATE * 2  # 5 minutes of 16kHz mono s16
+
+
+class MediaDecodeLimitError(Exception):
+    """A media decode hit MEDIA_DECODE_TIMEOUT or MEDIA_MAX_PCM_BYTES."""
+
+
+def _decode_url_with_pyav(url):
+    """Decode a media URL to 16kHz mono 16-bit PCM in-process with PyAV.
+
+    Avoids spawning ffmpeg and piping the decoded audio through stdout.
+    av.open()'s timeout only bounds each socket read, so the loop enforces
+    an overall deadline and size cap (endless radio/HLS streams).
+
+    Raises:
+        MediaDecodeLimitError: If either limit is hit.
+    """
+    deadline = time.monotonic() + MEDIA_DECODE_TIMEOUT
+    chunks = []
+    total = 0
+    with av.open(url, timeout=MEDIA_DECODE_TIMEOUT) as container:
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=SAMPLE_RATE)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                pcm = _pyav_frame_pcm(out)
+                chunks.append(pcm)
+                total += len(pcm)
+            if total > MEDIA_MAX_PCM_BYTES:
+                raise MediaDecodeLimitError(f"decoded audio exceeds {MEDIA_MAX_PCM_BYTES} bytes")
+            if time.monotonic() > deadline:
+                raise MediaDecodeLimitError(f"decode exceeded {MEDIA_DECODE_TIMEOUT:.0f}s")
+        # Flush the resampler's internal FIFO so the tail isn't lost
+        for out in resampler.resample(None):
+            chunks.append(_pyav_frame_pcm(out))
+    return b''.join(chunks)
+
+
 def fetch_and_convert_audio(url):
     """Fetch audio from URL and convert to 16kHz mono PCM."""
     log.info(f"Fetching audio: {url}")
 
+    if av is not None:
+        try:
+            return _decode_url_with_pyav(url)
+        except MediaDecodeLimitError as e:
+            # Retrying with ffmpeg would only burn another timeout on the same stream
+            log.warning(f"Audio fetch aborted: {e}")
+            return None
+        except Exception as e:
+            log.warning(f"PyAV decode failed, falling back to ffmpeg: {e}")
+
     try:
         # Use ffmpeg to fetch and convert in one step
         # Output: 16kHz, mono, 16-bit signed little-endian PCM
@@ -1305,7 +1706,7 @@ def fetch_and_convert_audio(url):
             '-'
         ]
 
-        result = subprocess.run(cmd, capture_output=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=True, timeout=MEDIA_DECODE_TIMEOUT)
 
         if result.returncode != 0:
             log.error(f"ffmpeg error: {result.stderr.decode()}")
@@ -1321,6 +1722,23 @@ def fetch_and_convert_audio(url):
         return None
 
 
+def _create_opus_encoder(application=None):
+    """Create an Opus encoder with the intercom's bitrate and FEC settings.
+
+    application defaults to APPLICATION_VOIP.
+    """
+    if application is None:
+        application = opuslib.APPLICATION_VOIP
+    enc = opuslib.Encoder(SAMPLE_RATE, CHANNELS, application)
+    enc.bitrate = OPUS_BITRATE
+    try:
+        enc.inband_fec = 1
+        enc.packet_loss_perc = 10
+    except (TypeError, AttributeError):
+        pass  # opuslib version may have broken ctl_set property setters
+    return enc
+
+
 def get_tts_encoder():
     """Get or create the reusable Opus encoder for TTS/media broadcast.
 
@@ -1332,13 +1750,7 @@ def get_tts_encoder():
     global tts_encoder
 
     if tts_encoder is None and opuslib:
-        tts_encoder = opuslib.Encoder(SAMPLE_RATE, CHANNELS, opuslib.APPLICATION_VOIP)
-        tts_encoder.bitrate = OPUS_BITRATE
-        try:
-            tts_encoder.inband_fec = 1
-            tts_encoder.packet_loss_perc = 10
-        except (TypeError, AttributeError):
-            pass  # opuslib version may have broken ctl_set property setters
+        tts_encoder = _create_opus_encoder()
         log.info("TTS Opus encoder initialized")
 
     return tts_encoder
@@ -1363,8 +1775,6 @@ def _convert_wav_to_16k_mono_pcm(raw: bytes, nchannels: int, sampwidth: int, fra
     Returns:
         Raw PCM bytes: 16-bit signed little-endian, mono, 16kHz.
     """
-    import struct as _struct
-
     n_frames = len(raw) // (nchannels * sampwidth)
 
     # --- Step 1: Unpack to list of 16-bit mono samples ---
@@ -1372,24 +1782,24 @@ def _convert_wav_to_16k_mono_pcm(raw: bytes, nchannels: int, sampwidth: int, fra
     if sampwidth == 1:
         # 8-bit WAV is unsigned; shift to signed
         fmt_in = f"{n_frames * nchannels}B"
-        raw_samples = list(_struct.unpack(fmt_in, raw))
+        raw_samples = list(struct.unpack(fmt_in, raw))
         # Convert unsigned 8-bit [0..255] to signed 16-bit [-32768..32767]
         raw_samples = [(s - 128) << 8 for s in raw_samples]
     elif sampwidth == 2:
         fmt_in = f"<{n_frames * nchannels}h"
-        raw_samples = list(_struct.unpack(fmt_in, raw))
+        raw_samples = list(struct.unpack(fmt_in, raw))
     elif sampwidth == 3:
-        # 24-bit has no direct struct format; unpack manually
+        # 24-bit has no direct struct format; unpack manually.
+        # Index the buffer directly rather than slicing a 3-byte object per sample.
         raw_samples = []
-        for i in range(n_frames * nchannels):
-            b = raw[i * 3:(i + 1) * 3]
-            val = b[0] | (b[1] << 8) | (b[2] << 16)
+        for j in range(0, n_frames * nchannels * 3, 3):
+            val = raw[j] | (raw[j + 1] << 8) | (raw[j + 2] << 16)
             if val >= 0x800000:
                 val -= 0x1000000
             raw_samples.append(val >> 8)  # Scale to 16-bit
     elif sampwidth == 4:
         fmt_in = f"<{n_frames * nchannels}i"
-        raw_samples = list(_struct.unpack(fmt_in, raw))
+        raw_samples = list(struct.unpack(fmt_in, raw))
         raw_samples = [s >> 16 for s in raw_samples]  # Scale to 16-bit
     else:
         raise ValueError(f"Unsupported sample width: {sampwidth} bytes")
@@ -1429,7 +1839,7 @@ def _convert_wav_to_16k_mono_pcm(raw: bytes, nchannels: int, sampwidth: int, fra
                 resampled.append(max(-32768, min(32767, val)))
 
     # --- Pack to bytes (16-bit signed little-endian) ---
-    return _struct.pack(f"<{len(resampled)}h", *resampled)
+    return struct.pack(f"<{len(resampled)}h", *resampled)
 
 
 def load_chime(filepath: Path) -> list:
@@ -1444,14 +1854,12 @@ def load_chime(filepath: Path) -> list:
 
     Returns an empty list if opuslib is unavailable or the file is unreadable.
     """
-    import wave as _wave
-
     if not opuslib:
         log.warning(f"opuslib not available — chime '{filepath.name}' will not be encoded")
         return []
 
     try:
-        with _wave.open(str(filepath), 'rb') as wf:
+        with wave.open(str(filepath), 'rb') as wf:
             params = wf.getparams()
             raw = wf.readframes(params.nframes)
     except Exception as e:
@@ -1479,13 +1887,7 @@ def load_chime(filepath: Path) -> list:
 
     # Dedicated encoder — isolated from TTS encoder to avoid state pollution
     try:
-        enc = opuslib.Encoder(SAMPLE_RATE, CHANNELS, opuslib.APPLICATION_VOIP)
-        enc.bitrate = OPUS_BITRATE
-        try:
-            enc.inband_fec = 1
-            enc.packet_loss_perc = 10
-        except (TypeError, AttributeError):
-            pass  # Some opuslib builds have broken ctl_set property setters
+        enc = _create_opus_encoder()
     except Exception as e:
         log.error(f"Failed to create Opus encoder for chime: {e}")
         return []
@@ -1512,7 +1914,6 @@ def load_chime(filepath: Path) -> list:
 
 def _seed_persistent_chimes() -> None:
     """Copy bundled default chimes to persistent /data/chimes if not already present."""
-    import shutil
     CHIMES_PATH.mkdir(parents=True, exist_ok=True)
     if not BUNDLED_CHIMES_PATH.exists():
         return
@@ -1552,15 +1953,143 @@ def load_all_chimes() -> None:
         else:
             log.warning(f"Chime '{name}' failed to load — skipped")
 
+    refresh_chime_catalog()
     log.info(f"Total chimes loaded: {len(loaded_chimes)} ({', '.join(loaded_chimes.keys())})")
 
 
+# SCHED_FIFO priorities.  RX sits above TX so incoming packets are drained
+# promptly even while a broadcast is being paced on a single-core host.
+TX_RT_PRIORITY = 10
+RX_RT_PRIORITY = 20
+
+
+def _set_realtime_priority(priority: int) -> bool:
+    """Switch the calling thread to SCHED_FIFO; return False if not permitted."""
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (AttributeError, PermissionError, OSError):
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def _realtime_priority():
+    """Run the calling thread under SCHED_FIFO for the duration of the block.
+
+    Yields True if the real-time policy was applied.  Requires CAP_SYS_NICE,
+    which the add-on container does not grant by default — in that case this
+    yields False and frame wakeups are subject to normal scheduler latency.  The
+    previous policy is restored on exit because streaming may run on a
+    reused executor thread.
+    """
+    try:
+        old_policy = os.sched_getscheduler(0)
+        old_param = os.sched_getparam(0)
+    except (AttributeError, OSError):
+        yield False
+        return
+    if not _set_realtime_priority(TX_RT_PRIORITY):
+        yield False
+        return
+
+    try:
+        yield True
+    finally:
+        try:
+            os.sched_setscheduler(0, old_policy, old_param)
+        except OSError as e:
+            log.warning(f"Could not restore thread scheduling policy: {e}")
+
+
+def encode_silence_frames(encoder, count: int) -> list:
+    """Encode count frames of silence, replaying the packet once output settles.
+
+    The first silence frames after audio still carry codec state (overlap
+    tail, predictor history), so they are encoded fresh.  Once two
+    consecutive packets come out byte-identical the encoder has converged
+    on silence and the remaining frames reuse that packet instead of
+    running the encoder again.
+    """
+    frames = []
+    settled = None
+    for _ in range(count):
+        if settled is not None:
+            frames.append(settled)
+            continue
+        packet = encoder.encode(SILENCE_PCM, FRAME_SIZE)
+        if frames and packet == frames[-1]:
+            settled = packet
+        frames.append(packet)
+    return frames
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+_CLOCK_MONOTONIC = getattr(time, 'CLOCK_MONOTONIC', 1)
+_TIMER_ABSTIME = 1
+
+try:
+    _clock_nanosleep = ctypes.CDLL(None, use_errno=True).clock_nanosleep
+    _clock_nanosleep.argtypes = [ctypes.c_int, ctypes.c_int,
+                                 ctypes.POINTER(_Timespec), ctypes.POINTER(_Timespec)]
+    _clock_nanosleep.restype = ctypes.c_int
+except (OSError, AttributeError):
+    _clock_nanosleep = None
+
+
+def _sleep_until(deadline: float) -> None:
+    """Block until time.monotonic() reaches deadline.
+
+    Sleeps with clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME), which the
+    kernel wakes off a high-resolution timer at the deadline itself, so
+    there is no window between computing the remaining time and sleeping
+    and no CPU burned waiting.  time.monotonic() reads the same clock.
+    Shared by the broadcast and chime pacing loops.
+    """
+    if _clock_nanosleep is None:
+        sleep_time = deadline - time.monotonic()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        return
+
+    sec = int(deadline)
+    ts = _Timespec(sec, int((deadline - sec) * 1_000_000_000))
+    # Returns the error number directly; retry if a signal interrupts us
+    while _clock_nanosleep(_CLOCK_MONOTONIC, _TIMER_ABSTIME, ctypes.byref(ts), None) == errno.EINTR:
+        pass
+
+
+def _encode_and_send(encoder, pcm, target_ip: Optional[str], priority: int) -> None:
+    """Encode one web PTT frame and send it (runs on the encode thread)."""
+    try:
+        send_audio_packet(encoder.encode(pcm, FRAME_SIZE), target_ip, priority=priority)
+    except Exception as e:
+        log.error(f"Web PTT encode failed: {e}")
+
+
+async def send_paced_frames(frames, target_ip: Optional[str], priority: int) -> None:
+    """Send Opus frames one per FRAME_DURATION_MS from the event loop.
+
+    Frames are paced against a monotonic deadline rather than a fixed
+    sleep, so event loop latency doesn't accumulate across the burst.
+    """
+    period = FRAME_DURATION_MS / 1000.0
+    next_tx = time.monotonic()
+    for opus_data in frames:
+        send_audio_packet(opus_data, target_ip, priority=priority)
+        next_tx += period
+        delay = next_tx - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
 def _stream_chime_blocking(target_ip: Optional[str], frames: list, chime_name: str) -> None:
     """Stream chime frames with precise timing (runs in a thread).
 
-    Uses the same coarse-sleep + busy-wait pattern as encode_and_broadcast()
-    for <1ms timing accuracy.  Runs via loop.run_in_executor() so it doesn't
-    block the asyncio event loop.
+    Uses the same absolute-deadline pacing as encode_and_broadcast().
+    Runs via loop.run_in_executor() so it doesn't block the asyncio event loop.
 
     Acquires tx_lock and sets current_state to prevent concurrent TTS/chime
     streams from interleaving packets on the same socket.
@@ -1586,45 +2115,36 @@ def _stream_chime_blocking(target_ip: Optional[str], frames: list, chime_name: s
         consecutive_errors = 0
         first_frame_sent = False
 
-        for i, opus_frame in enumerate(frames):
-            packet = DEVICE_ID + struct.pack('>IB', chime_seq, PRIORITY_HIGH) + opus_frame
-            chime_seq += 1
-
-            try:
-                if target_ip:
-                    tx_socket.sendto(packet, (target_ip, MULTICAST_PORT))
-                else:
-                    tx_socket.sendto(packet, (MULTICAST_GROUP, MULTICAST_PORT))
-                if not first_frame_sent:
-                    first_frame_sent = True
-                    log.debug(
-                        f"Chime '{chime_name}' first frame sent at t+{(time.monotonic()-start_time)*1000:.1f}ms"
-                    )
-                mcast_metrics.record_tx(success=True)
-                audio_capture.record("tx", DEVICE_ID_STR, chime_seq - 1, PRIORITY_HIGH,
-                                    opus_frame, target_ip=target_ip or MULTICAST_GROUP)
-                consecutive_errors = 0
-            except Exception as e:
-                mcast_metrics.record_tx(success=False)
-                consecutive_errors += 1
-                log.error(f"Chime send error at frame {i}: {e}")
-                if consecutive_errors >= 5:
-                    log.error("Chime aborted: 5 consecutive send errors")
-                    break
-                continue
-
-            # Calculate target time for next frame
-            next_frame_time = start_time + ((i + 1) * frame_interval)
+        with _realtime_priority():
+            for i, opus_frame in enumerate(frames):
+                packet = _build_packet(chime_seq, PRIORITY_HIGH, opus_frame)
+                chime_seq += 1
 
-            # Coarse sleep (to within 3ms of target)
-            now = time.monotonic()
-            sleep_time = next_frame_time - now - 0.003
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+                try:
+                    if target_ip:
+                        tx_socket.sendto(packet, (target_ip, MULTICAST_PORT))
+                    else:
+                        tx_socket.sendto(packet, (MULTICAST_GROUP, MULTICAST_PORT))
+                    if not first_frame_sent:
+                        first_frame_sent = True
+                        log.debug(
+                            f"Chime '{chime_name}' first frame sent at t+{(time.monotonic()-start_time)*1000:.1f}ms"
+                        )
+                    mcast_metrics.record_tx(success=True)
+                    audio_capture.record("tx", DEVICE_ID_STR, chime_seq - 1, PRIORITY_HIGH,
+                                        opus_frame, target_ip=target_ip or MULTICAST_GROUP)
+                    consecutive_errors = 0
+                except Exception as e:
+                    mcast_metrics.record_tx(success=False)
+                    consecutive_errors += 1
+                    log.error(f"Chime send error at frame {i}: {e}")
+                    if consecutive_errors >= 5:
+                        log.error("Chime aborted: 5 consecutive send errors")
+                        break
+                    continue
 
-            # Fine-grained busy-wait for precise timing
-            while time.monotonic() < next_frame_time:
-                pass
+                # Wait for the target time of the next frame
+                _sleep_until(start_time + ((i + 1) * frame_interval))
 
         elapsed = time.monotonic() - start_time
         expected = len(frames) * frame_interval
@@ -1645,7 +2165,7 @@ async def stream_chime_to_target(target_ip: Optional[str], chime_name: str = "")
     """Stream pre-encoded chime frames to a target device (or multicast).
 
     Delegates to _stream_chime_blocking() in a thread for precise timing
-    (coarse-sleep + busy-wait, same pattern as encode_and_broadcast).
+    (absolute-deadline sleeps, same pattern as encode_and_broadcast).
     Uses PRIORITY_HIGH so the chime preempts ongoing NORMAL transmissions.
 
     Args:
@@ -1668,25 +2188,38 @@ async def stream_chime_to_target(target_ip: Optional[str], chime_name: str = "")
     await loop.run_in_executor(None, _stream_chime_blocking, target_ip, frames, chime_name)
 
 
+def refresh_chime_catalog() -> None:
+    """Rebuild the cached chime name/metadata lists after loaded_chimes changes.
+
+    Both lists are replaced wholesale, so readers on other threads always
+    see a complete list.
+    """
+    global _chime_options, _chime_list
+    names = sorted(loaded_chimes)
+    _chime_list = [
+        {
+            "name": name,
+            "frames": len(loaded_chimes[name]),
+            "duration": round(len(loaded_chimes[name]) * FRAME_DURATION_MS / 1000.0, 2),
+        }
+        for name in names
+    ]
+    _chime_options = names
+
+
 def get_chime_options() -> list:
     """Return sorted list of available chime names for HA select entity."""
-    if not loaded_chimes:
+    if not _chime_options:
         return ["doorbell"]  # Fallback label even if loading failed
-    return sorted(loaded_chimes.keys())
+    return _chime_options
 
 
 def publish_chime_select() -> None:
     """Publish HA MQTT discovery config for the chime selector."""
-    if not mqtt_client or not mqtt_client.is_connected():
+    if not _mqtt_connected:
         return
 
-    device_info = {
-        "identifiers": [DEVICE_ID_STR],
-        "name": DEVICE_NAME,
-        "model": "Intercom Hub",
-        "manufacturer": "guywithacomputer",
-        "sw_version": VERSION
-    }
+    device_info = HUB_DEVICE_INFO
 
     options = get_chime_options()
 
@@ -1704,7 +2237,7 @@ def publish_chime_select() -> None:
 
     mqtt_client.publish(
         f"homeassistant/select/{UNIQUE_ID}_chime/config",
-        json.dumps(chime_config),
+        _json_dumps(chime_config),
         retain=True
     )
     log.debug(f"Published chime select discovery: {options}")
@@ -1712,16 +2245,18 @@ def publish_chime_select() -> None:
 
 def publish_chime() -> None:
     """Publish current chime selection to MQTT."""
-    if mqtt_client and mqtt_client.is_connected():
+    if _mqtt_connected:
         mqtt_client.publish(CHIME_STATE_TOPIC, current_chime, retain=True)
 
 
 def encode_and_broadcast(pcm_data):
     """Encode PCM to Opus and send via multicast or unicast based on target.
 
-    Uses two-phase approach for consistent timing:
-    1. Pre-encode all frames (variable time, doesn't affect playback)
-    2. Send with precise timing (busy-wait for accuracy)
+    Encoding is pipelined with sending: only the lead-in silence is encoded
+    up front, and each later frame is encoded in the slack after the
+    previous send while the thread waits for the next 20ms deadline.  The
+    first packet leaves without waiting for the whole clip to encode, and
+    sends stay on their absolute deadlines.
 
     Also forwards raw PCM to web clients.
     """
@@ -1730,13 +2265,14 @@ def encode_and_broadcast(pcm_data):
     if len(pcm_data) == 0:
         return
 
-    # Prepare raw PCM frames for web clients (need to send from async context)
+    # Prepare raw PCM frames for web clients (need to send from async context).
+    # Slices of a memoryview share pcm_data's buffer, so no per-frame copies.
     frame_bytes = FRAME_SIZE * 2
-    pcm_frames = []
-    offset = 0
-    while offset + frame_bytes <= len(pcm_data):
-        pcm_frames.append(pcm_data[offset:offset + frame_bytes])
-        offset += frame_bytes
+    pcm_view = memoryview(pcm_data)
+    pcm_frames = [
+        pcm_view[offset:offset + frame_bytes]
+        for offset in range(0, len(pcm_data) - frame_bytes + 1, frame_bytes)
+    ]
 
     # Prevent concurrent transmissions
     if not tx_lock.acquire(blocking=False):
@@ -1756,13 +2292,11 @@ def encode_and_broadcast(pcm_data):
         target_ip = get_target_ip()
         target_desc = f"to {current_target}" if target_ip else "to all rooms"
 
-        frame_bytes = FRAME_SIZE * 2  # 16-bit samples = 640 bytes per frame
-        audio_frames = len(pcm_data) // frame_bytes
+        audio_frames = len(pcm_frames)
+        total_frames = audio_frames + 45
         audio_duration = audio_frames * FRAME_DURATION_MS / 1000.0
-        log.info(f"Broadcasting: {audio_frames} audio frames ({audio_duration:.2f}s) + 15 lead-in + 30 trail-out = {audio_frames+45} total frames")
+        log.info(f"Broadcasting: {audio_frames} audio frames ({audio_duration:.2f}s) + 15 lead-in + 30 trail-out = {total_frames} total frames")
 
-        # === PHASE 1: PRE-ENCODE ALL FRAMES ===
-        # This separates encoding time from transmission timing
         encoder = get_tts_encoder()
         if encoder is None:
             log.error("No Opus encoder available for broadcast")
@@ -1774,77 +2308,56 @@ def encode_and_broadcast(pcm_data):
         except (AttributeError, Exception):
             log.debug("Opus encoder reset_state not available — skipping")
 
-        encoded_frames = []
-        silence_pcm = bytes(frame_bytes)
-
-        # Lead-in silence (300ms = 15 frames) - lets ESP32 jitter buffer prime
-        # Encode each frame fresh to maintain encoder state continuity
-        for _ in range(15):
-            silence_opus = encoder.encode(silence_pcm, FRAME_SIZE)
-            encoded_frames.append(silence_opus)
+        def encoded_frames():
+            # Lead-in silence (300ms = 15 frames) - lets ESP32 jitter buffer prime
+            # Encoded fresh until the encoder settles, to maintain state continuity
+            yield from encode_silence_frames(encoder, 15)
 
-        # Encode actual audio frames
-        offset = 0
-        while offset + frame_bytes <= len(pcm_data):
-            frame = pcm_data[offset:offset + frame_bytes]
-            opus_data = encoder.encode(frame, FRAME_SIZE)
-            encoded_frames.append(opus_data)
-            offset += frame_bytes
+            # Actual audio frames (opuslib's ctypes binding needs bytes)
+            for frame in pcm_frames:
+                yield encoder.encode(frame.tobytes(), FRAME_SIZE)
 
-        # Trail-out silence (600ms = 30 frames) - flush ESP32 buffers
-        # Must encode fresh to maintain decoder state continuity
-        for _ in range(30):
-            silence_opus = encoder.encode(silence_pcm, FRAME_SIZE)
-            encoded_frames.append(silence_opus)
+            # Trail-out silence (600ms = 30 frames) - flush ESP32 buffers
+            # Encoded fresh until the encoder settles, to maintain decoder state continuity
+            yield from encode_silence_frames(encoder, 30)
 
-        # === PHASE 2: SEND WITH PRECISE TIMING ===
-        log.debug(f"Sending {len(encoded_frames)} frames {target_desc}...")
+        log.debug(f"Sending {total_frames} frames {target_desc}...")
 
         frame_interval = FRAME_DURATION_MS / 1000.0  # 0.02 seconds
+        frames = encoded_frames()
+        opus_data = next(frames)
         start_time = time.monotonic()
 
-        # PCM frame index for web client forwarding (skip lead-in silence)
-        pcm_frame_idx = 0
-
-        for i, opus_data in enumerate(encoded_frames):
-            # Send packet to ESP32s
-            send_audio_packet(opus_data, target_ip)
-
-            # Forward PCM to web clients (skip lead-in/trail-out silence)
-            # Lead-in is first 15 frames, actual audio is next len(pcm_frames), trail-out is last 30
-            if 15 <= i < 15 + len(pcm_frames) and web_clients and web_event_loop:
-                pcm_frame = pcm_frames[pcm_frame_idx]
-                pcm_frame_idx += 1
-                try:
-                    asyncio.run_coroutine_threadsafe(
-                        broadcast_to_web_clients(pcm_frame),
-                        web_event_loop
-                    )
-                except Exception:
-                    pass
-
-            # Calculate target time for next frame
-            next_frame_time = start_time + ((i + 1) * frame_interval)
+        # Lead-in is first 15 frames, actual audio is next len(pcm_frames), trail-out is last 30
+        audio_end = 15 + len(pcm_frames)
+
+        with _realtime_priority():
+            for i in range(total_frames):
+                # Send packet to ESP32s
+                send_audio_packet(opus_data, target_ip)
+
+                # Forward PCM to web clients (skip lead-in/trail-out silence)
+                if 15 <= i < audio_end and web_clients and web_event_loop:
+                    try:
+                        web_event_loop.call_soon_threadsafe(
+                            broadcast_to_web_clients, pcm_frames[i - 15]
+                        )
+                    except Exception:
+                        pass
 
-            # Coarse sleep (to within 3ms of target)
-            now = time.monotonic()
-            sleep_time = next_frame_time - now - 0.003
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+                # Encode the next frame while waiting for its send time
+                opus_data = next(frames, None)
 
-            # Fine-grained busy-wait for precise timing
-            # This burns CPU but gives <1ms accuracy
-            while time.monotonic() < next_frame_time:
-                pass
+                # Wait for the target time of the next frame
+                _sleep_until(start_time + ((i + 1) * frame_interval))
 
         elapsed = time.monotonic() - start_time
-        expected = len(encoded_frames) * frame_interval
+        expected = total_frames * frame_interval
         drift_ms = (elapsed - expected) * 1000
-        log.info(f"Broadcast complete: {len(encoded_frames)} frames in {elapsed:.2f}s (expected {expected:.2f}s, drift: {drift_ms:+.1f}ms)")
+        log.info(f"Broadcast complete: {total_frames} frames in {elapsed:.2f}s (expected {expected:.2f}s, drift: {drift_ms:+.1f}ms)")
 
     except Exception as e:
         log.error(f"encoding/sending audio: {e}")
-        import traceback
         traceback.print_exc()
 
     finally:
@@ -1854,20 +2367,36 @@ def encode_and_broadcast(pcm_data):
         tx_lock.release()
 
 
+# Worker threads for announce/play_media jobs (fetch/TTS + paced broadcast).
+# Reused across requests instead of starting a thread per MQTT message;
+# broadcasts serialize on tx_lock anyway, so two workers is plenty.
+_media_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="media")
+
+
+def _log_media_job_error(future):
+    """Done-callback: surface exceptions that would otherwise die in the future."""
+    exc = future.exception()
+    if exc is not None:
+        log.error(f"media job failed: {exc!r}")
+
+
+def _submit_media_job(fn):
+    _media_executor.submit(fn).add_done_callback(_log_media_job_error)
+
+
 def play_media(url):
     """Handle play_media command - fetch, convert, broadcast."""
     if not validate_url(url):
         log.warning(f"play_media URL rejected: {url[:100]}")
         return
 
-    # Run in thread to not block MQTT
+    # Run on a worker thread to not block MQTT
     def _play():
         pcm_data = fetch_and_convert_audio(url)
         if pcm_data:
             encode_and_broadcast(pcm_data)
 
-    thread = threading.Thread(target=_play)
-    thread.start()
+    _submit_media_job(_play)
 
 
 def announce(message):
@@ -1890,21 +2419,17 @@ def announce(message):
         if pcm_data:
             encode_and_broadcast(pcm_data)
 
-    thread = threading.Thread(target=_announce)
-    thread.start()
+    _submit_media_job(_announce)
 
 
-def publish_discovery():
-    """Publish Home Assistant MQTT discovery configs."""
-    global mqtt_client
+def _build_discovery_payloads():
+    """Serialize the static entity discovery configs as (topic, payload) pairs.
 
-    device_info = {
-        "identifiers": [DEVICE_ID_STR],
-        "name": DEVICE_NAME,
-        "model": "Intercom Hub",
-        "manufacturer": "guywithacomputer",
-        "sw_version": VERSION
-    }
+    Everything here is fixed once DEVICE_NAME/UNIQUE_ID are known, so it is
+    built on the first connect and replayed on reconnects.
+    """
+    device_info = HUB_DEVICE_INFO
+    payloads = []
 
     # Notify entity - send text (TTS) or URL to broadcast
     notify_config = {
@@ -1917,18 +2442,10 @@ def publish_discovery():
         "icon": "mdi:bullhorn"
     }
 
-    mqtt_client.publish(
-        f"homeassistant/notify/{UNIQUE_ID}/config",
-        json.dumps(notify_config),
-        retain=True
-    )
+    payloads.append((f"homeassistant/notify/{UNIQUE_ID}/config", _json_dumps(notify_config)))
 
     # Also clear the old media_player config if it exists
-    mqtt_client.publish(
-        f"homeassistant/media_player/{UNIQUE_ID}/config",
-        "",
-        retain=True
-    )
+    payloads.append((f"homeassistant/media_player/{UNIQUE_ID}/config", ""))
 
     # Status sensor (same as ESP32)
     sensor_config = {
@@ -1941,11 +2458,7 @@ def publish_discovery():
         "icon": "mdi:phone-classic"
     }
 
-    mqtt_client.publish(
-        f"homeassistant/sensor/{UNIQUE_ID}_state/config",
-        json.dumps(sensor_config),
-        retain=True
-    )
+    payloads.append((f"homeassistant/sensor/{UNIQUE_ID}_state/config", _json_dumps(sensor_config)))
 
     # Volume number
     volume_config = {
@@ -1964,11 +2477,7 @@ def publish_discovery():
         "mode": "slider"
     }
 
-    mqtt_client.publish(
-        f"homeassistant/number/{UNIQUE_ID}_volume/config",
-        json.dumps(volume_config),
-        retain=True
-    )
+    payloads.append((f"homeassistant/number/{UNIQUE_ID}_volume/config", _json_dumps(volume_config)))
 
     # Mute switch
     mute_config = {
@@ -1984,14 +2493,7 @@ def publish_discovery():
         "icon": "mdi:volume-off"
     }
 
-    mqtt_client.publish(
-        f"homeassistant/switch/{UNIQUE_ID}_mute/config",
-        json.dumps(mute_config),
-        retain=True
-    )
-
-    # Target room select - will be updated when devices are discovered
-    update_target_select_options()
+    payloads.append((f"homeassistant/switch/{UNIQUE_ID}_mute/config", _json_dumps(mute_config)))
 
     # Priority select
     priority_config = {
@@ -2002,14 +2504,10 @@ def publish_discovery():
         "state_topic": PRIORITY_STATE_TOPIC,
         "command_topic": PRIORITY_CMD_TOPIC,
         "availability_topic": AVAILABILITY_TOPIC,
-        "options": ["Normal", "High", "Emergency"],
+        "options": list(PRIORITY_MAP),
         "icon": "mdi:alert-circle-outline"
     }
-    mqtt_client.publish(
-        f"homeassistant/select/{UNIQUE_ID}_priority/config",
-        json.dumps(priority_config),
-        retain=True
-    )
+    payloads.append((f"homeassistant/select/{UNIQUE_ID}_priority/config", _json_dumps(priority_config)))
 
     # DND switch
     dnd_config = {
@@ -2024,15 +2522,80 @@ def publish_discovery():
         "payload_off": "OFF",
         "icon": "mdi:bell-sleep"
     }
-    mqtt_client.publish(
-        f"homeassistant/switch/{UNIQUE_ID}_dnd/config",
-        json.dumps(dnd_config),
-        retain=True
-    )
+    payloads.append((f"homeassistant/switch/{UNIQUE_ID}_dnd/config", _json_dumps(dnd_config)))
+
+    return payloads
+
+
+_discovery_payloads = None  # Cached result of _build_discovery_payloads()
+
+
+def publish_discovery():
+    """Publish Home Assistant MQTT discovery configs."""
+    global _discovery_payloads, _last_published_options
+
+    if _discovery_payloads is None:
+        _discovery_payloads = _build_discovery_payloads()
+    for topic, payload in _discovery_payloads:
+        mqtt_client.publish(topic, payload, retain=True)
+
+    # Target room select - will be updated when devices are discovered
+    with _device_index_lock:
+        _last_published_options = None  # Force a re-publish (broker may have restarted)
+        update_target_select_options()
 
     log.info("Published HA discovery configs")
 
 
+# Retained state publishes are coalesced: bursts of transitions within
+# MQTT_COALESCE_DELAY (e.g. idle -> transmitting -> idle during call setup)
+# go to the broker as one publish per topic carrying the final value.
+MQTT_COALESCE_DELAY = 0.05
+_pending_publishes = {}  # topic -> latest payload awaiting flush
+_last_published = {}  # topic -> payload last sent; unchanged values are not re-sent
+# Guards both dicts; held across compare + publish + update so flushes and
+# the reconnect reset in on_mqtt_connect never interleave
+_publish_lock = threading.Lock()
+_publish_pending = threading.Condition(_publish_lock)
+_publish_thread = None  # Long-lived flusher, started on first use
+
+
+def schedule_publish(topic, value):
+    """Queue a retained publish; the latest value per topic wins."""
+    global _publish_thread
+    with _publish_lock:
+        _pending_publishes[topic] = value
+        if _publish_thread is None:
+            _publish_thread = threading.Thread(target=_publish_loop, name="mqtt-publish", daemon=True)
+            _publish_thread.start()
+        _publish_pending.notify()
+
+
+def _publish_loop():
+    """Flush coalesced publishes forever (runs on the mqtt-publish thread)."""
+    while True:
+        with _publish_lock:
+            while not _pending_publishes:
+                _publish_pending.wait()
+        # Let the rest of the burst arrive before publishing
+        time.sleep(MQTT_COALESCE_DELAY)
+        _flush_publishes()
+
+
+def _flush_publishes():
+    """Publish every pending topic once."""
+    with _publish_lock:
+        pending = dict(_pending_publishes)
+        _pending_publishes.clear()
+
+        if _mqtt_connected:
+            for topic, value in pending.items():
+                if _last_published.get(topic) == value:
+                    continue
+                _last_published[topic] = value
+                mqtt_client.publish(topic, value, qos=0, retain=True)
+
+
 def publish_state(state=None, notify_web=True, source="hub"):
     """Publish current state to MQTT and optionally web clients.
 
@@ -2047,8 +2610,11 @@ def publish_state(state=None, notify_web=True, source="hub"):
     if state is None:
         state = current_state
 
-    if mqtt_client and mqtt_client.is_connected():
-        mqtt_client.publish(STATE_TOPIC, state, retain=True)
+    if state == "idle":
+        with channel_free:
+            channel_free.notify_all()
+
+    schedule_publish(STATE_TOPIC, state)
 
     # Also notify web clients (thread-safe) unless caller handles it
     if notify_web:
@@ -2064,7 +2630,7 @@ def notify_web_clients_state(state=None, source="hub"):
         source: Who triggered the state change ("hub" or a client websocket)
                 When hub transmits (TTS), clients should receive, not transmit.
     """
-    global web_event_loop
+    global web_event_loop, _last_web_state
 
     if not web_clients or web_event_loop is None:
         return
@@ -2078,30 +2644,31 @@ def notify_web_clients_state(state=None, source="hub"):
     if state == "transmitting" and source == "hub":
         web_state = "receiving"  # Hub TX means clients RX
 
+    # Every client already shows this state - skip the broadcast
+    if web_state == _last_web_state:
+        return
+    _last_web_state = web_state
+
     try:
-        asyncio.run_coroutine_threadsafe(
-            broadcast_to_web_clients({'type': 'state', 'status': web_state}),
-            web_event_loop
+        web_event_loop.call_soon_threadsafe(
+            broadcast_to_web_clients, _state_message(web_state)
         )
     except Exception as e:
         log.error(f"notifying web clients: {e}")
 
 
-async def notify_single_web_client(target_device, state):
-    """Notify a specific web client of state change."""
+def notify_single_web_client(target_device, state):
+    """Notify a specific web client of state change (event loop thread only)."""
+    global _last_web_state
     if not web_clients or not target_device:
         return
 
-    for client, client_id in list(web_client_ids.items()):
-        if client_id == target_device:
-            try:
-                await client.send_json({'type': 'state', 'status': state})
-                log.debug(f"Notified {client_id} of state: {state}")
-            except Exception:
-                web_clients.discard(client)
-                if client in web_client_ids:
-                    del web_client_ids[client]
-            return
+    _last_web_state = None  # Clients no longer all share one state
+
+    clients = web_clients_by_id.get(target_device)
+    if clients:
+        queue_for_web_clients(clients, _state_message(state))
+        log.debug(f"Notified {target_device} of state: {state}")
 
 
 def notify_targeted_web_client_state(target_device, state):
@@ -2111,28 +2678,48 @@ def notify_targeted_web_client_state(target_device, state):
         target_device: The client_id to notify (e.g., "Brians_Phone")
         state: The state to send ("receiving", "idle", etc.)
     """
-    global web_event_loop
+    global web_event_loop, _last_web_state
 
     if not web_clients or web_event_loop is None or not target_device:
         return
 
+    # Invalidate the broadcast dedupe now, on the caller's thread: a
+    # broadcast issued before the scheduled send runs must not be skipped
+    # against a state the clients are about to stop sharing
+    _last_web_state = None
     try:
-        asyncio.run_coroutine_threadsafe(
-            notify_single_web_client(target_device, state),
-            web_event_loop
-        )
+        web_event_loop.call_soon_threadsafe(notify_single_web_client, target_device, state)
     except Exception as e:
         log.error(f"notifying targeted web client: {e}")
 
 
-def forward_audio_to_web_clients(pcm_data, priority=None):
-    """Forward audio to web clients (thread-safe).
+# RX thread -> event loop handoff for decoded audio.  Frames are queued
+# here and one scheduled drain delivers everything pending, so a burst of
+# packets costs a single loop wakeup.  Bounded so a stalled loop drops the
+# oldest (stale) audio instead of growing without limit.
+_rx_forward_frames = deque(maxlen=64)
+_rx_forward_scheduled = False
+
+
+def _drain_rx_forward_frames():
+    """Deliver queued RX audio to web clients (event loop thread only)."""
+    global _rx_forward_scheduled
+    # Clear the flag before draining: a frame appended after this point
+    # either gets drained below or schedules a fresh drain
+    _rx_forward_scheduled = False
+    while _rx_forward_frames:
+        pcm_data, priority = _rx_forward_frames.popleft()
+        broadcast_audio_to_web_clients(pcm_data, priority)
+
+
+def forward_audio_to_web_clients(pcm_data, priority=None):
+    """Forward audio to web clients (thread-safe).
 
     Args:
         pcm_data: Raw PCM bytes to forward.
         priority: PRIORITY_* constant — sent to web clients for DND/emergency handling.
     """
-    global web_event_loop
+    global web_event_loop, _rx_forward_scheduled
 
     if priority is None:
         priority = PRIORITY_NORMAL
@@ -2140,89 +2727,118 @@ def forward_audio_to_web_clients(pcm_data, priority=None):
     if not web_clients or web_event_loop is None:
         return
 
+    _rx_forward_frames.append((pcm_data, priority))
+    if _rx_forward_scheduled:
+        return
+    _rx_forward_scheduled = True
     try:
-        asyncio.run_coroutine_threadsafe(
-            broadcast_audio_to_web_clients(pcm_data, priority=priority),
-            web_event_loop
-        )
+        web_event_loop.call_soon_threadsafe(_drain_rx_forward_frames)
     except Exception as e:
+        _rx_forward_scheduled = False
         log.error(f"forwarding audio to web clients: {e}")
 
 
 def publish_volume():
     """Publish current volume."""
-    if mqtt_client and mqtt_client.is_connected():
-        mqtt_client.publish(VOLUME_STATE_TOPIC, str(current_volume), retain=True)
+    schedule_publish(VOLUME_STATE_TOPIC, str(current_volume))
 
 
 def publish_mute():
     """Publish mute state."""
-    if mqtt_client and mqtt_client.is_connected():
-        mqtt_client.publish(MUTE_STATE_TOPIC, "ON" if is_muted else "OFF", retain=True)
+    schedule_publish(MUTE_STATE_TOPIC, "ON" if is_muted else "OFF")
 
 
 def publish_target():
     """Publish current target."""
-    if mqtt_client and mqtt_client.is_connected():
-        mqtt_client.publish(TARGET_STATE_TOPIC, current_target, retain=True)
+    schedule_publish(TARGET_STATE_TOPIC, current_target)
 
 
 def publish_priority():
     """Publish current hub TX priority."""
-    if mqtt_client and mqtt_client.is_connected():
-        names = {PRIORITY_NORMAL: "Normal", PRIORITY_HIGH: "High", PRIORITY_EMERGENCY: "Emergency"}
-        mqtt_client.publish(PRIORITY_STATE_TOPIC, names.get(current_tx_priority, "Normal"), retain=True)
+    schedule_publish(PRIORITY_STATE_TOPIC, PRIORITY_NAMES.get(current_tx_priority, "Normal"))
 
 
 def publish_dnd():
     """Publish current hub DND state."""
-    if mqtt_client and mqtt_client.is_connected():
-        mqtt_client.publish(DND_STATE_TOPIC, "ON" if hub_dnd_enabled else "OFF", retain=True)
+    schedule_publish(DND_STATE_TOPIC, "ON" if hub_dnd_enabled else "OFF")
+
+
+# Serializes index rebuilds with the target select publish that follows
+# them (MQTT thread on device changes, refresh thread on mobile reloads)
+_device_index_lock = threading.Lock()
+
+
+def _refresh_device_indexes():
+    """Rebuild the room indexes and re-publish the target select if rooms changed."""
+    with _device_index_lock:
+        if _rebuild_device_indexes():
+            update_target_select_options()
+
+
+def _rebuild_device_indexes():
+    """Recompute the room indexes from discovered_devices.
+
+    Call via _refresh_device_indexes(), which holds _device_index_lock and
+    acts on the "changed" result; whoever consumes a change must publish it.
+
+    Returns True if the sorted room list changed.  Each index is replaced
+    wholesale, so readers on other threads always see a consistent object.
+    """
+    global _target_rooms, _room_to_ip, _mobile_rooms
+    room_to_ip = {}
+    for info in list(discovered_devices.values()):
+        room_to_ip.setdefault(info["room"], info["ip"])
+    _room_to_ip = room_to_ip
+    _mobile_rooms = frozenset(room for room in room_to_ip if is_mobile_device(room))
+
+    rooms = sorted(room_to_ip)
+    if rooms == _target_rooms:
+        return False
+    _target_rooms = rooms
+    return True
+
+
+def _add_device(device_id, room, ip):
+    """Record (or refresh) a discovered device and update the indexes if it changed."""
+    previous = discovered_devices.get(device_id)
+    discovered_devices[device_id] = {"room": room, "ip": ip}
+
+    if previous is None:
+        log.info(f"Discovered device: {room} ({device_id}) at {ip}")
+    # Heartbeats from known devices leave the indexes alone
+    if previous is None or previous["room"] != room or previous["ip"] != ip:
+        _refresh_device_indexes()
+
+
+def _remove_device(device_id):
+    """Forget a discovered device and update the indexes."""
+    info = discovered_devices.pop(device_id, None)
+    if info is None:
+        return
+    log.info(f"Device offline, removed: {info.get('room', device_id)} ({device_id})")
+    _refresh_device_indexes()
 
 
 def get_target_options():
     """Get list of target options for the select entity."""
-    options = ["All Rooms"]
-    # Add discovered rooms (sorted alphabetically)
-    rooms = sorted(set(d["room"] for d in discovered_devices.values()))
-    options.extend(rooms)
-    return options
+    # Discovered rooms are kept sorted alphabetically in _target_rooms
+    return ["All Rooms"] + _target_rooms
 
 
 def update_target_select_options():
     """Re-publish target select discovery with updated options."""
-    if not mqtt_client or not mqtt_client.is_connected():
+    if not _mqtt_connected:
         return
 
-    device_info = {
-        "identifiers": [DEVICE_ID_STR],
-        "name": DEVICE_NAME,
-        "model": "Intercom Hub",
-        "manufacturer": "guywithacomputer",
-        "sw_version": VERSION
-    }
-
+    global _last_published_options
     options = get_target_options()
+    if tuple(options) == _last_published_options:
+        return
+    _last_published_options = tuple(options)
 
     # Target room select
-    target_config = {
-        "name": "Target",
-        "unique_id": f"{UNIQUE_ID}_target",
-        "default_entity_id": f"select.{UNIQUE_ID}_target",
-        "device": device_info,
-        "state_topic": TARGET_STATE_TOPIC,
-        "command_topic": TARGET_CMD_TOPIC,
-        "availability_topic": AVAILABILITY_TOPIC,
-        "options": options,
-        "icon": "mdi:target",
-        "has_entity_name": True
-    }
-
-    mqtt_client.publish(
-        f"homeassistant/select/{UNIQUE_ID}_target/config",
-        json.dumps(target_config),
-        retain=True
-    )
+    payload = f"{_TARGET_SELECT_CONFIG_PREFIX}{_json_dumps(options)}}}"
+    mqtt_client.publish(TARGET_SELECT_CONFIG_TOPIC, payload, retain=True)
 
     # Ensure current target is still valid
     global current_target
@@ -2233,6 +2849,11 @@ def update_target_select_options():
 
 def on_mqtt_connect(client, userdata, flags, reason_code, properties=None):
     """Handle MQTT connection."""
+    global _mqtt_connected
+    _mqtt_connected = not getattr(reason_code, "is_failure", False)
+    # The broker may have lost retained state while we were away - resend everything
+    with _publish_lock:
+        _last_published.clear()
     log.info(f"Connected to MQTT broker (rc={reason_code})")
 
     # Subscribe to command topics
@@ -2300,14 +2921,12 @@ def on_mqtt_connect(client, userdata, flags, reason_code, properties=None):
     log.info("Cleared old WebClients aggregate device")
 
     # Clear any stale web client entries for mobile devices
-    for mobile in MOBILE_DEVICES:
-        safe_id = mobile["name"].replace(' ', '_').replace('/', '_').lower()
-        stale_topic = f"intercom/devices/{UNIQUE_ID}_web_{safe_id}/info"
-        stale_status = f"intercom/{UNIQUE_ID}_web_{safe_id}/status"
+    stale_topics = _mobile_stale_topics
+    for stale_topic, stale_status in stale_topics:
         client.publish(stale_topic, "", retain=True)
         client.publish(stale_status, "offline", retain=True)
-    if MOBILE_DEVICES:
-        log.info(f"Cleared stale web client entries for {len(MOBILE_DEVICES)} mobile device(s)")
+    if stale_topics:
+        log.info(f"Cleared stale web client entries for {len(stale_topics)} mobile device(s)")
 
     # Publish online status
     client.publish(AVAILABILITY_TOPIC, "online", retain=True)
@@ -2323,241 +2942,278 @@ def on_mqtt_connect(client, userdata, flags, reason_code, properties=None):
     publish_chime()
 
 
-def on_mqtt_message(client, userdata, msg):
-    """Handle MQTT messages."""
-    global current_volume, is_muted, current_target, discovered_devices
-    global current_tx_priority, hub_dnd_enabled
+def _handle_volume_cmd(client, raw):
+    global current_volume
+    try:
+        current_volume = int(float(raw))
+        current_volume = max(0, min(100, current_volume))
+        publish_volume()
+    except ValueError:
+        pass
 
-    topic = msg.topic
-    payload = msg.payload.decode('utf-8')
 
-    # Don't log device info spam
-    if not topic.startswith("intercom/devices/"):
-        log.debug(f"MQTT: {topic} = {payload}")
+def _handle_mute_cmd(client, raw):
+    global is_muted
+    is_muted = (raw.upper() == b"ON")
+    publish_mute()
 
-    if topic == VOLUME_CMD_TOPIC:
-        try:
-            current_volume = int(float(payload))
-            current_volume = max(0, min(100, current_volume))
-            publish_volume()
-        except ValueError:
-            pass
-
-    elif topic == MUTE_CMD_TOPIC:
-        is_muted = (payload.upper() == "ON")
-        publish_mute()
-
-    elif topic == TARGET_CMD_TOPIC:
-        # Target room selection (sanitize input)
-        sanitized_target = sanitize_room_name(payload)
-        if sanitized_target:
-            current_target = sanitized_target
-            publish_target()
-            log.info(f"Target set to: {current_target}")
-        else:
-            log.warning(f"Invalid target rejected from MQTT: {repr(payload[:20])}")
-
-    elif topic == PRIORITY_CMD_TOPIC:
-        # Priority select: "Normal", "High", "Emergency"
-        priority_map = {"Normal": PRIORITY_NORMAL, "High": PRIORITY_HIGH, "Emergency": PRIORITY_EMERGENCY}
-        current_tx_priority = priority_map.get(payload, PRIORITY_NORMAL)
-        publish_priority()
-        log.info(f"Hub TX priority set to: {payload} ({current_tx_priority})")
-
-    elif topic == DND_CMD_TOPIC:
-        hub_dnd_enabled = (payload.upper() == "ON")
-        publish_dnd()
-        log.info(f"Hub DND {'enabled' if hub_dnd_enabled else 'disabled'}")
-
-    elif topic == CHIME_CMD_TOPIC:
-        # Chime selection: payload is the chime name (e.g. "doorbell")
-        global current_chime
-        new_chime = sanitize_string(payload, 64).strip()
-        if new_chime in loaded_chimes:
-            current_chime = new_chime
-            publish_chime()
-            log.info(f"Chime set to: {current_chime}")
-            # Notify web clients of chime change from MQTT
-            if web_event_loop:
-                asyncio.run_coroutine_threadsafe(
-                    broadcast_to_web_clients({
-                        'type': 'chimes',
-                        'options': get_chime_options(),
-                        'current': current_chime
-                    }),
-                    web_event_loop
-                )
-        elif loaded_chimes:
-            # Requested chime not available — use first loaded chime
-            current_chime = next(iter(loaded_chimes))
-            publish_chime()
-            log.warning(f"Chime '{new_chime}' not found, falling back to '{current_chime}'")
-
-    elif topic.startswith("intercom/devices/") and topic.endswith("/info"):
-        # Device info from ESP32 intercoms (validate inputs)
-        try:
-            data = json.loads(payload)
-            if not isinstance(data, dict):
-                return
-            device_id = sanitize_string(data.get("id", ""), 64)
-            room = sanitize_room_name(data.get("room", ""))
-            ip = data.get("ip", "")
-
-            # Validate all fields before accepting
-            if device_id and room and validate_ip_address(ip):
-                old_devices = set(discovered_devices.keys())
-                discovered_devices[device_id] = {"room": room, "ip": ip}
-
-                # If new device, update the select options
-                if device_id not in old_devices:
-                    log.info(f"Discovered device: {room} ({device_id}) at {ip}")
-                    update_target_select_options()
-            else:
-                log.warning(f"Invalid device info rejected: id={repr(device_id[:20] if device_id else '')}")
 
-        except json.JSONDecodeError:
-            pass
+def _handle_target_cmd(client, raw):
+    """Target room selection (sanitize input)."""
+    global current_target
+    payload = raw.decode('utf-8')
+    sanitized_target = sanitize_room_name(payload)
+    if sanitized_target:
+        current_target = sanitized_target
+        publish_target()
+        log.info(f"Target set to: {current_target}")
+    else:
+        log.warning(f"Invalid target rejected from MQTT: {repr(payload[:20])}")
 
-    elif topic == NOTIFY_CMD_TOPIC:
-        # Notify service sends message - can be text (TTS) or URL
-        # HA sends: just the message text, or JSON with "message" field
-        message = payload
-        try:
-            data = json.loads(payload)
-            if isinstance(data, dict):
-                message = data.get("message", payload)
-            elif isinstance(data, str):
-                message = data
-        except json.JSONDecodeError:
-            pass
-
-        if message:
-            announce(message)
-
-    elif topic == MOBILE_CALL_TOPIC:
-        # Call notification — stream chime audio to target, then handle mobile notification.
-        # The chime is streamed from the hub so ESP32 devices no longer need local PCM data.
-        try:
-            data = json.loads(payload)
-            if not isinstance(data, dict):
-                return
 
-            # Skip calls that originated from this hub (via WebSocket) to prevent
-            # double-streaming: the WS call handler already streams the chime and
-            # sends mobile notifications before publishing to MQTT.
-            if data.get("source") == "hub":
-                return
+def _handle_priority_cmd(client, raw):
+    """Priority select: "Normal", "High", "Emergency"."""
+    global current_tx_priority
+    payload = raw.decode('utf-8')
+    current_tx_priority = PRIORITY_MAP.get(payload, PRIORITY_NORMAL)
+    publish_priority()
+    log.info(f"Hub TX priority set to: {payload} ({current_tx_priority})")
 
-            target = sanitize_room_name(data.get("target", ""))
-            caller = sanitize_room_name(data.get("caller", "Intercom")) or "Intercom"
 
-            if not target:
-                return
+def _handle_dnd_cmd(client, raw):
+    global hub_dnd_enabled
+    hub_dnd_enabled = (raw.upper() == b"ON")
+    publish_dnd()
+    log.info(f"Hub DND {'enabled' if hub_dnd_enabled else 'disabled'}")
 
-            log.info(f"Call: {caller} -> {target}")
-
-            # Resolve target IP for unicast chime delivery.
-            # 'All Rooms' / 'all' -> multicast (target_ip = None).
-            target_lower = target.lower()
-            if target_lower in ("all rooms", "all"):
-                chime_target_ip = None
-                # Send mobile notifications for all mobile devices when caller is an ESP32
-                for dev_info in discovered_devices.values():
-                    room = dev_info.get("room", "")
-                    if room and is_mobile_device(room) and room != caller:
-                        send_mobile_notification(room, caller)
-            else:
-                chime_target_ip = None
-                for dev_info in discovered_devices.values():
-                    if dev_info.get("room") == target:
-                        chime_target_ip = dev_info.get("ip")
-                        break
-                if chime_target_ip is None:
-                    log.warning(f"Chime for '{target}' skipped: target IP not found in discovered devices")
-                    return  # Don't accidentally multicast a single-target call
-
-            # Stream chime in background (async coroutine scheduled on the web event loop).
-            # Capture chime_name and target_ip by value to avoid closure/late-binding issues.
-            if loaded_chimes and web_event_loop is not None:
-                _chime_name = current_chime   # Snapshot at dispatch time
-                _target_ip = chime_target_ip  # Already a local variable
-                _t_dispatch = time.monotonic()
-
-                def _schedule_chime(_cn=_chime_name, _ip=_target_ip, _t=_t_dispatch):
-                    lag_ms = (time.monotonic() - _t) * 1000
-                    log.debug(f"Chime dispatch lag: {lag_ms:.1f}ms (MQTT->UDP)")
-                    asyncio.run_coroutine_threadsafe(
-                        stream_chime_to_target(_ip, _cn),
-                        web_event_loop
-                    )
 
-                chime_thread = threading.Thread(target=_schedule_chime, daemon=True)
-                chime_thread.start()
-            else:
-                log.debug("Chime not streamed: no chimes loaded or event loop unavailable")
+def _handle_chime_cmd(client, raw):
+    """Chime selection: payload is the chime name (e.g. "doorbell")."""
+    global current_chime
+    new_chime = sanitize_string(raw.decode('utf-8'), 64).strip()
+    if new_chime in loaded_chimes:
+        current_chime = new_chime
+        publish_chime()
+        log.info(f"Chime set to: {current_chime}")
+        # Notify web clients of chime change from MQTT
+        if web_event_loop:
+            web_event_loop.call_soon_threadsafe(
+                broadcast_to_web_clients, {
+                    'type': 'chimes',
+                    'options': get_chime_options(),
+                    'current': current_chime
+                }
+            )
+    elif loaded_chimes:
+        # Requested chime not available — use first loaded chime
+        current_chime = next(iter(loaded_chimes))
+        publish_chime()
+        log.warning(f"Chime '{new_chime}' not found, falling back to '{current_chime}'")
 
-            # Mobile notification (push alert) if target is a mobile device (single-room call)
-            if target_lower not in ("all rooms", "all") and is_mobile_device(target):
-                send_mobile_notification(target, caller)
 
-        except Exception as e:
-            if not isinstance(e, json.JSONDecodeError):
-                log.warning(f"Error processing call message: {e}")
-
-    elif topic.startswith("intercom/") and topic.endswith("/state"):
-        # ESP32 state update - track target for audio routing
-        # Topic format: intercom/<device_id>/state
-        # Skip our own state topic
-        if topic == STATE_TOPIC:
+def _handle_notify_cmd(client, raw):
+    """Notify service sends message - can be text (TTS) or URL.
+
+    HA sends just the message text, or JSON with a "message" field.
+    """
+    payload = raw.decode('utf-8')
+    message = payload
+    try:
+        data = _json_loads(raw)
+        if isinstance(data, dict):
+            message = data.get("message", payload)
+        elif isinstance(data, str):
+            message = data
+    except json.JSONDecodeError:
+        pass
+
+    if message:
+        announce(message)
+
+
+def _handle_mobile_call(client, raw):
+    """Call notification — stream chime audio to target, then handle mobile notification.
+
+    The chime is streamed from the hub so ESP32 devices no longer need local PCM data.
+    """
+    try:
+        data = _json_loads(raw)
+        if not isinstance(data, dict):
             return
 
-        parts = topic.split("/")
-        if len(parts) == 3:
-            device_id = parts[1]
-            try:
-                data = json.loads(payload)
-                if not isinstance(data, dict):
-                    raise json.JSONDecodeError("not a dict", payload, 0)
-                state = data.get("state", "")
-                target = data.get("target", "")
-
-                if state == "transmitting" and target:
-                    # Track this ESP32's target
-                    esp32_targets[device_id] = target
-                    log.info(f"ESP32 {device_id} targeting: {target}")
-                elif state == "idle":
-                    # Clear target when idle
-                    if device_id in esp32_targets:
-                        del esp32_targets[device_id]
-                        log.debug(f"ESP32 {device_id} target cleared")
-            except json.JSONDecodeError:
-                # Might be plain string like "idle", not JSON
-                if payload == "idle" and device_id in esp32_targets:
-                    del esp32_targets[device_id]
-
-    elif topic.startswith("intercom/") and topic.endswith("/status"):
-        # Device availability (LWT) - remove offline devices from discovery list
-        # Topic: intercom/<unique_id>/status, payload: "online" or "offline"
-        parts = topic.split("/")
-        if len(parts) == 3:
-            device_id = parts[1]
-            if payload == "offline":
-                if device_id in discovered_devices:
-                    room = discovered_devices[device_id].get("room", device_id)
-                    del discovered_devices[device_id]
-                    log.info(f"Device offline, removed: {room} ({device_id})")
-                    update_target_select_options()
-                # Always clear retained device info to prevent zombie entries on broker.
-                # Devices re-publish their info on reconnect, so clearing on offline is safe.
-                client.publish(f"intercom/devices/{device_id}/info", "", retain=True, qos=1)
-                log.debug(f"Cleared retained info for offline device: {device_id}")
-            elif payload == "online":
-                # Device came back online - info will re-populate via /info topic
-                log.debug(f"Device online: {device_id}")
+        # Skip calls that originated from this hub (via WebSocket) to prevent
+        # double-streaming: the WS call handler already streams the chime and
+        # sends mobile notifications before publishing to MQTT.
+        if data.get("source") == "hub":
+            return
+
+        target = sanitize_room_name(data.get("target", ""))
+        caller = sanitize_room_name(data.get("caller", "Intercom")) or "Intercom"
+
+        if not target:
+            return
+
+        log.info(f"Call: {caller} -> {target}")
+
+        # Resolve target IP for unicast chime delivery.
+        # 'All Rooms' / 'all' -> multicast (target_ip = None).
+        target_lower = target.lower()
+        if target_lower in ("all rooms", "all"):
+            chime_target_ip = None
+            # Send mobile notifications for all mobile devices when caller is an ESP32
+            for room in _mobile_rooms:
+                if room != caller:
+                    queue_mobile_notification(room, caller)
+        else:
+            chime_target_ip = _room_to_ip.get(target)
+            if chime_target_ip is None:
+                log.warning(f"Chime for '{target}' skipped: target IP not found in discovered devices")
+                return  # Don't accidentally multicast a single-target call
+
+        # Stream chime in background (async coroutine scheduled on the web event loop).
+        # run_coroutine_threadsafe is safe to call straight from the MQTT thread.
+        if loaded_chimes and web_event_loop is not None:
+            t_dispatch = time.monotonic()
+            future = asyncio.run_coroutine_threadsafe(
+                stream_chime_to_target(chime_target_ip, current_chime),
+                web_event_loop
+            )
+            future.add_done_callback(
+                lambda _f: log.debug(f"Chime done {(time.monotonic() - t_dispatch) * 1000:.1f}ms after MQTT dispatch")
+            )
+        else:
+            log.debug("Chime not streamed: no chimes loaded or event loop unavailable")
+
+        # Mobile notification (push alert) if target is a mobile device (single-room call)
+        if target_lower not in ("all rooms", "all") and is_mobile_device(target):
+            queue_mobile_notification(target, caller)
+
+    except Exception as e:
+        if not isinstance(e, json.JSONDecodeError):
+            log.warning(f"Error processing call message: {e}")
+
+
+def _handle_device_info(client, raw):
+    """Device info from ESP32 intercoms (validate inputs)."""
+    try:
+        data = _json_loads(raw)
+        if not isinstance(data, dict):
+            return
+        device_id = sanitize_string(data.get("id", ""), 64)
+        room = sanitize_room_name(data.get("room", ""))
+        ip = data.get("ip", "")
+
+        # Validate all fields before accepting
+        if device_id and room and validate_ip_address(ip):
+            _add_device(device_id, room, ip)
+        else:
+            log.warning(f"Invalid device info rejected: id={repr(device_id[:20] if device_id else '')}")
+
+    except json.JSONDecodeError:
+        pass
+
+
+def _handle_device_state(client, device_id, raw):
+    """ESP32 state update (intercom/<device_id>/state) - track target for audio routing."""
+    # Skip our own state topic
+    if device_id == UNIQUE_ID:
+        return
+
+    try:
+        data = _json_loads(raw)
+        if not isinstance(data, dict):
+            raise json.JSONDecodeError("not a dict", "", 0)
+        state = data.get("state", "")
+        target = data.get("target", "")
+
+        if state == "transmitting" and target:
+            # Track this ESP32's target
+            esp32_targets[device_id] = target
+            log.info(f"ESP32 {device_id} targeting: {target}")
+        elif state == "idle":
+            # Clear target when idle
+            if device_id in esp32_targets:
+                del esp32_targets[device_id]
+                log.debug(f"ESP32 {device_id} target cleared")
+    except json.JSONDecodeError:
+        # Might be plain string like "idle", not JSON
+        if raw == b"idle" and device_id in esp32_targets:
+            del esp32_targets[device_id]
+
+
+def _handle_device_status(client, device_id, raw):
+    """Device availability (LWT) - remove offline devices from discovery list.
+
+    Topic: intercom/<unique_id>/status, payload: "online" or "offline"
+    """
+    if raw == b"offline":
+        _remove_device(device_id)
+        # Always clear retained device info to prevent zombie entries on broker.
+        # Devices re-publish their info on reconnect, so clearing on offline is safe.
+        client.publish(f"intercom/devices/{device_id}/info", "", retain=True, qos=1)
+        log.debug(f"Cleared retained info for offline device: {device_id}")
+    elif raw == b"online":
+        # Device came back online - info will re-populate via /info topic
+        log.debug(f"Device online: {device_id}")
+
+
+# Exact-topic handlers: fn(client, raw_payload)
+_TOPIC_HANDLERS = {
+    VOLUME_CMD_TOPIC: _handle_volume_cmd,
+    MUTE_CMD_TOPIC: _handle_mute_cmd,
+    TARGET_CMD_TOPIC: _handle_target_cmd,
+    PRIORITY_CMD_TOPIC: _handle_priority_cmd,
+    DND_CMD_TOPIC: _handle_dnd_cmd,
+    CHIME_CMD_TOPIC: _handle_chime_cmd,
+    NOTIFY_CMD_TOPIC: _handle_notify_cmd,
+    MOBILE_CALL_TOPIC: _handle_mobile_call,
+}
+
+# Per-device handlers for intercom/<device_id>/<suffix>: fn(client, device_id, raw_payload)
+_DEVICE_TOPIC_HANDLERS = {
+    "state": _handle_device_state,
+    "status": _handle_device_status,
+}
+
+
+def on_mqtt_message(client, userdata, msg):
+    """Handle MQTT messages.
+
+    Exact topics dispatch through _TOPIC_HANDLERS; wildcard subscriptions
+    are matched by splitting the topic once.
+    """
+    topic = msg.topic
+    # Raw bytes: only handlers that need text decode it (float() and the
+    # JSON parser take bytes directly, ON/OFF-style checks compare bytes)
+    raw = msg.payload
+
+    # Topic is split once; every check below works off parts
+    parts = topic.split("/", 3)
+    is_device_info = len(parts) == 4 and parts[1] == "devices"
+
+    # Don't log device info spam
+    if not is_device_info and log.isEnabledFor(logging.DEBUG):
+        log.debug(f"MQTT: {topic} = {raw.decode('utf-8', 'replace')}")
+
+    handler = _TOPIC_HANDLERS.get(topic)
+    if handler is not None:
+        handler(client, raw)
+        return
+
+    if parts[0] != "intercom":
+        return
+    if is_device_info and parts[3] == "info":
+        _handle_device_info(client, raw)
+    elif len(parts) == 3:
+        device_handler = _DEVICE_TOPIC_HANDLERS.get(parts[2])
+        if device_handler is not None:
+            device_handler(client, parts[1], raw)
 
 
 def on_mqtt_disconnect(client, userdata, disconnect_flags, reason_code, properties=None):
     """Handle MQTT disconnection."""
+    global _mqtt_connected
+    _mqtt_connected = False
     log.warning(f"Disconnected from MQTT (rc={reason_code})")
 
 
@@ -2568,13 +3224,29 @@ def on_mqtt_disconnect(client, userdata, disconnect_flags, reason_code, properti
 async def websocket_handler(request):
     """Handle WebSocket connections for web PTT."""
     global web_ptt_active, web_ptt_encoder, current_state, current_chime, last_web_ptt_frame_time
+    global _last_web_state, _web_encoder
 
     log.debug(f"WebSocket connection request from {request.remote}")
-    ws = web.WebSocketResponse()
+    # Audio frames don't compress - never negotiate permessage-deflate.
+    ws = web.WebSocketResponse(compress=False)
     await ws.prepare(request)
     log.debug(f"WebSocket prepared for {request.remote}")
 
+    # Audio frames are small and latency-sensitive: send each immediately
+    # (no Nagle) and give bursts like the trail-out room in the send buffer
+    sock = request.transport.get_extra_info('socket') if request.transport else None
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 256 * 1024)
+        except OSError as e:
+            log.debug(f"WebSocket socket options not applied: {e}")
+
     web_clients.add(ws)
+    _refresh_clients_snapshot()
+    _last_web_state = None  # Next state change must reach the new client too
+    out_queue = asyncio.Queue(maxsize=WEB_CLIENT_QUEUE_SIZE)
+    web_client_queues[ws] = (out_queue, asyncio.create_task(_web_client_writer(ws, out_queue)))
     log.info(f"Web PTT client connected ({len(web_clients)} total)")
 
     # Note: encoder is created fresh at ptt_start, not here.
@@ -2597,28 +3269,29 @@ async def websocket_handler(request):
     }
     if suggested_name:
         init_msg['suggested_name'] = suggested_name
-    await ws.send_json(init_msg)
-    await ws.send_json({
+    await ws.send_str(_json_dumps(init_msg))
+    await ws.send_str(_json_dumps({
         'type': 'targets',
-        'rooms': sorted(set(d['room'] for d in discovered_devices.values() ))
-    })
-    await ws.send_json({
+        'rooms': _target_rooms
+    }))
+    await ws.send_str(_json_dumps({
         'type': 'chimes',
         'options': get_chime_options(),
         'current': current_chime
-    })
+    }))
 
     # Send recent call info if within timeout (for auto-select)
     if recent_call["caller"] and time.time() - recent_call["timestamp"] < RECENT_CALL_TIMEOUT:
-        await ws.send_json({
+        await ws.send_str(_json_dumps({
             'type': 'recent_call',
             'caller': recent_call["caller"]
-        })
+        }))
         log.info(f"Sent recent call info to Web PTT: {recent_call['caller']}")
 
     ptt_active = False
     ptt_target = None
     ptt_target_room = 'all'  # Track target room name for web client forwarding
+    ptt_is_broadcast = True  # ptt_target_room addresses every web client
     ptt_priority = PRIORITY_NORMAL  # Web client's chosen TX priority
     frame_count = 0
     lead_in_sent = False
@@ -2631,44 +3304,38 @@ async def websocket_handler(request):
                 if ptt_active and web_ptt_encoder and len(msg.data) == FRAME_SIZE * 2:
                     # Send lead-in silence on first frame
                     if not lead_in_sent:
-                        silence_pcm = bytes(FRAME_SIZE * 2)
-                        silence_opus = web_ptt_encoder.encode(silence_pcm, FRAME_SIZE)
-                        for _ in range(15):  # 300ms lead-in
-                            send_audio_packet(silence_opus, ptt_target, priority=ptt_priority)
-                            await asyncio.sleep(FRAME_DURATION_MS / 1000.0)
+                        silence_opus = await asyncio.get_running_loop().run_in_executor(
+                            _encode_executor, web_ptt_encoder.encode, SILENCE_PCM, FRAME_SIZE
+                        )
+                        await send_paced_frames([silence_opus] * 15, ptt_target, ptt_priority)  # 300ms lead-in
                         lead_in_sent = True
 
-                    # Encode and send to ESP32s
-                    opus_data = web_ptt_encoder.encode(msg.data, FRAME_SIZE)
-                    send_audio_packet(opus_data, ptt_target, priority=ptt_priority)
+                    # Encode and send to ESP32s on the encode thread - frame
+                    # ingestion never waits on the encoder or the UDP socket
+                    _encode_executor.submit(
+                        _encode_and_send, web_ptt_encoder, msg.data, ptt_target, ptt_priority
+                    )
                     frame_count += 1
-                    last_web_ptt_frame_time = time.monotonic()
-
-                    # Forward PCM to other web clients (respect target)
-                    # Prepend priority byte so receiver can apply DND filtering
-                    web_frame = bytes([ptt_priority]) + msg.data
-                    is_broadcast = ptt_target_room.lower() in ('all', 'all rooms')
-                    for other_client in web_clients.copy():
-                        if other_client == ws:
-                            continue
-                        # Check if this client should receive
-                        other_id = web_client_ids.get(other_client)
-                        if is_broadcast or other_id == ptt_target_room:
-                            try:
-                                await other_client.send_bytes(web_frame)
-                            except Exception:
-                                pass
+                    # Idle timeout is seconds-coarse: refresh the timestamp every 8 frames (160ms)
+                    if not frame_count & 7:
+                        last_web_ptt_frame_time = time.monotonic()
+
+                    # Forward PCM to other web clients (respect target) - nothing
+                    # to do when the talker is the only one connected
+                    if len(_clients_snapshot) > 1:
+                        # Prepend priority byte so receiver can apply DND filtering
+                        web_frame = _PRIORITY_PREFIXES[ptt_priority] + msg.data
+                        targets = _clients_snapshot if ptt_is_broadcast else web_clients_by_id.get(ptt_target_room, ())
+                        queue_for_web_clients([c for c in targets if c is not ws], web_frame)
 
             elif msg.type == web.WSMsgType.TEXT:
                 try:
-                    data = json.loads(msg.data)
+                    data = _json_loads(msg.data)
                     msg_type = data.get('type')
 
                     if msg_type == 'ptt_start':
                         # Read priority from web client (defaults to Normal)
-                        raw_priority_str = data.get('priority', 'Normal')
-                        priority_map = {'Normal': PRIORITY_NORMAL, 'High': PRIORITY_HIGH, 'Emergency': PRIORITY_EMERGENCY}
-                        ptt_priority = priority_map.get(raw_priority_str, PRIORITY_NORMAL)
+                        ptt_priority = PRIORITY_MAP.get(data.get('priority', 'Normal'), PRIORITY_NORMAL)
 
                         # Wait for any previous transmission to finish (including trail-out)
                         # This queues transmissions like TTS announcements do
@@ -2681,7 +3348,7 @@ async def websocket_handler(request):
                             if holding_lock:
                                 web_tx_lock.release()
                                 holding_lock = False
-                            await ws.send_json({'type': 'busy'})
+                            await ws.send_str(_json_dumps({'type': 'busy'}))
                         else:
                             ptt_active = True
                             with state_lock:
@@ -2689,16 +3356,24 @@ async def websocket_handler(request):
                             lead_in_sent = False
                             frame_count = 0
 
-                            # Create FRESH encoder for this PTT session
+                            # Reuse one encoder, reset to a fresh state for this PTT session
                             # (critical: encoder state must not carry over between sessions)
                             if opuslib:
-                                web_ptt_encoder = opuslib.Encoder(SAMPLE_RATE, CHANNELS, opuslib.APPLICATION_VOIP)
-                                web_ptt_encoder.bitrate = OPUS_BITRATE
-                                try:
-                                    web_ptt_encoder.inband_fec = 1
-                                    web_ptt_encoder.packet_loss_perc = 10
-                                except (TypeError, AttributeError):
-                                    pass  # opuslib version may have broken ctl_set property setters
+                                if _web_encoder is not None:
+                                    try:
+                                        # Queued behind any frames still pending from a previous session
+                                        await asyncio.get_running_loop().run_in_executor(
+                                            _encode_executor, _web_encoder.reset_state
+                                        )
+                                    except Exception as e:
+                                        log.warning(f"Web PTT encoder reset failed ({e}) — creating a new encoder")
+                                        _web_encoder = None
+                                if _web_encoder is None:
+                                    _web_encoder = _create_opus_encoder(
+                                        opuslib.APPLICATION_RESTRICTED_LOWDELAY if WEB_PTT_LOW_DELAY
+                                        else opuslib.APPLICATION_VOIP
+                                    )
+                                web_ptt_encoder = _web_encoder
 
                             # Get target IP (no automatic notifications - use Call button)
                             raw_target = data.get('target', 'all')
@@ -2707,12 +3382,9 @@ async def websocket_handler(request):
                                 ptt_target = None
                                 ptt_target_room = 'all'
                             else:
-                                ptt_target = None
+                                ptt_target = _room_to_ip.get(target_room)
                                 ptt_target_room = target_room
-                                for dev in discovered_devices.values():
-                                    if dev.get('room') == target_room:
-                                        ptt_target = dev.get('ip')
-                                        break
+                            ptt_is_broadcast = ptt_target_room.lower() in _BROADCAST_NAMES
 
                             with state_lock:
                                 current_state = "transmitting"
@@ -2723,37 +3395,37 @@ async def websocket_handler(request):
                             log.info(f"Web PTT started -> {target_room}")
 
                             # Notify THIS client it's transmitting
-                            await ws.send_json({'type': 'state', 'status': 'transmitting'})
+                            _last_web_state = None  # Mixed: sender transmitting, others receiving
+                            await ws.send_str(_STATE_MESSAGES['transmitting'])
                             # Notify OTHER web clients they're receiving
-                            for other_client in web_clients.copy():
-                                if other_client != ws:
-                                    try:
-                                        await other_client.send_json({'type': 'state', 'status': 'receiving'})
-                                    except Exception:
-                                        pass
+                            queue_for_web_clients(
+                                [c for c in _clients_snapshot if c is not ws],
+                                _STATE_MESSAGES['receiving']
+                            )
 
                     elif msg_type == 'ptt_stop':
                         if ptt_active:
-                            # Send trail-out silence - encode FRESH each frame
-                            # (keeps codec state flowing naturally to end)
+                            # Send trail-out silence - encoded fresh until the encoder
+                            # settles (keeps codec state flowing naturally to end)
                             if web_ptt_encoder and lead_in_sent:
-                                silence_pcm = bytes(FRAME_SIZE * 2)
-                                for _ in range(30):  # 600ms trail-out
-                                    silence_opus = web_ptt_encoder.encode(silence_pcm, FRAME_SIZE)
-                                    send_audio_packet(silence_opus, ptt_target, priority=ptt_priority)
-                                    await asyncio.sleep(FRAME_DURATION_MS / 1000.0)
+                                # Queued behind the session's pending frames, so it follows them
+                                trail_out = await asyncio.get_running_loop().run_in_executor(
+                                    _encode_executor, encode_silence_frames, web_ptt_encoder, 30  # 600ms trail-out
+                                )
+                                await send_paced_frames(trail_out, ptt_target, ptt_priority)
 
                             ptt_active = False
                             with state_lock:
                                 web_ptt_active = False
                                 current_state = "idle"
-                            # Reset encoder - prevents state carryover to next session
+                            # End the session - the encoder is reset before its next use
                             web_ptt_encoder = None
                             publish_state(state="idle", notify_web=False)  # MQTT only - we handle web clients below
                             log.info(f"Web PTT stopped ({frame_count} frames)")
 
                             # Notify web clients immediately - don't make them wait for the jitter drain gap
-                            await broadcast_to_web_clients({'type': 'state', 'status': 'idle'})
+                            broadcast_to_web_clients(_STATE_MESSAGES['idle'])
+                            _last_web_state = 'idle'
 
                             # Gap for ESP32 jitter buffer to drain before next TX
                             await asyncio.sleep(0.75)
@@ -2764,22 +3436,19 @@ async def websocket_handler(request):
                                 holding_lock = False
 
                     elif msg_type == 'get_state':
-                        await ws.send_json({
-                            'type': 'state',
-                            'status': current_state
-                        })
+                        await ws.send_str(_state_message(current_state))
                         # Send targets excluding self
                         my_id = web_client_ids.get(ws)
-                        await ws.send_json({
+                        await ws.send_str(_json_dumps({
                             'type': 'targets',
-                            'rooms': sorted(set(d['room'] for d in discovered_devices.values() if d['room'] != my_id))
-                        })
+                            'rooms': [room for room in _target_rooms if room != my_id]
+                        }))
                         # Send chimes list
-                        await ws.send_json({
+                        await ws.send_str(_json_dumps({
                             'type': 'chimes',
                             'options': get_chime_options(),
                             'current': current_chime
-                        })
+                        }))
 
                     elif msg_type == 'set_target':
                         # Just acknowledge - actual target used at PTT start
@@ -2795,7 +3464,7 @@ async def websocket_handler(request):
                             if old_id and old_id != client_id and not is_mobile_device(old_id):
                                 publish_web_client_offline(old_id)
 
-                            web_client_ids[ws] = client_id
+                            _set_web_client_id(ws, client_id)
 
                             publish_web_client_online(client_id)
                             if is_mobile_device(client_id):
@@ -2804,10 +3473,10 @@ async def websocket_handler(request):
                                 log.info(f"Web client identified as: {client_id}")
 
                             # Send updated targets list (excluding self)
-                            await ws.send_json({
+                            await ws.send_str(_json_dumps({
                                 'type': 'targets',
-                                'rooms': sorted(set(d['room'] for d in discovered_devices.values() if d['room'] != client_id))
-                            })
+                                'rooms': [room for room in _target_rooms if room != client_id]
+                            }))
                         else:
                             log.warning(f"Invalid client_id from {request.remote}")
 
@@ -2823,23 +3492,16 @@ async def websocket_handler(request):
                             # eliminates the per-device publish race condition where later
                             # messages arrive after the 150ms chime-detection window.
                             rooms_called = []
-                            call_data = {
-                                "target": "All Rooms",
-                                "caller": safe_caller,
-                                "source": "hub",
-                                "chime": current_chime
-                            }
                             _t_mqtt = time.monotonic()
-                            mqtt_client.publish(MOBILE_CALL_TOPIC, json.dumps(call_data))
+                            publish_call("All Rooms", safe_caller, current_chime)
                             log.debug(f"Call all rooms MQTT published at t=0 (wall: {_t_mqtt:.3f})")
 
                             # Collect room names for logging; send mobile notifications separately
-                            for dev in list(discovered_devices.values()):
-                                room = dev.get('room', '')
-                                if not room or room == caller_name:
+                            for room in _target_rooms:
+                                if room == caller_name:
                                     continue
-                                if is_mobile_device(room):
-                                    send_mobile_notification(room, caller_name)
+                                if room in _mobile_rooms:
+                                    queue_mobile_notification(room, caller_name)
                                 rooms_called.append(room)
 
                             # Single multicast chime — all devices on the group receive it
@@ -2856,22 +3518,12 @@ async def websocket_handler(request):
                             log.info(f"Call all rooms: {caller_name} -> {rooms_called}")
                         elif target:
                             # Send call notification via MQTT (ESP32s listen)
-                            call_data = {
-                                "target": target,
-                                "caller": safe_caller,
-                                "source": "hub",
-                                "chime": current_chime
-                            }
-                            mqtt_client.publish(MOBILE_CALL_TOPIC, json.dumps(call_data))
+                            publish_call(target, safe_caller, current_chime)
                             log.info(f"Call: {caller_name} -> {target}")
 
                             # Stream chime to target
                             if loaded_chimes and web_event_loop is not None:
-                                chime_target_ip = None
-                                for dev_info in discovered_devices.values():
-                                    if dev_info.get("room") == target:
-                                        chime_target_ip = dev_info.get("ip")
-                                        break
+                                chime_target_ip = _room_to_ip.get(target)
                                 if chime_target_ip is None:
                                     log.warning(f"Chime for '{target}' skipped: target IP not found")
                                 else:
@@ -2884,7 +3536,7 @@ async def websocket_handler(request):
 
                             # Also send mobile notification if target is mobile
                             if is_mobile_device(target):
-                                send_mobile_notification(target, caller_name)
+                                queue_mobile_notification(target, caller_name)
                         elif raw_target:
                             log.warning(f"Invalid call target rejected: {repr(str(raw_target)[:20])}")
 
@@ -2896,7 +3548,7 @@ async def websocket_handler(request):
                             publish_chime()
                             log.info(f"Chime set via web: {current_chime}")
                             # Notify all web clients of the change
-                            await broadcast_to_web_clients({
+                            broadcast_to_web_clients({
                                 'type': 'chimes',
                                 'options': get_chime_options(),
                                 'current': current_chime
@@ -2930,32 +3582,138 @@ async def websocket_handler(request):
             web_tx_lock.release()
 
         web_clients.discard(ws)
+        _refresh_clients_snapshot()
+        _stop_web_client_writer(web_client_queues.pop(ws, None))
         # Clean up client identity and mark offline
-        if ws in web_client_ids:
-            client_id = web_client_ids[ws]
-            del web_client_ids[ws]
+        client_id = _forget_web_client_id(ws)
+        if client_id:
             publish_web_client_offline(client_id)
         log.info(f"Web PTT client disconnected ({len(web_clients)} remaining)")
 
     return ws
 
 
-async def broadcast_to_web_clients(message):
-    """Send a message to all connected web clients."""
-    if not web_clients:
+def _refresh_clients_snapshot():
+    """Rebuild _clients_snapshot after web_clients changes (event loop thread only).
+
+    Broadcast paths iterate the snapshot, so they neither copy the set per
+    frame nor trip over a set mutated mid-iteration.
+    """
+    global _clients_snapshot
+    _clients_snapshot = tuple(web_clients)
+
+
+def _set_web_client_id(client, client_id):
+    """Record a client's identity in both web_client_ids and web_clients_by_id."""
+    _forget_web_client_id(client)
+    web_client_ids[client] = client_id
+    web_clients_by_id.setdefault(client_id, set()).add(client)
+
+
+def _forget_web_client_id(client):
+    """Remove a client's identity from both maps, returning the old client_id."""
+    client_id = web_client_ids.pop(client, None)
+    clients = web_clients_by_id.get(client_id)
+    if clients is not None:
+        clients.discard(client)
+        if not clients:
+            del web_clients_by_id[client_id]
+    return client_id
+
+
+_closing_clients = set()  # Close tasks for dropped clients (kept referenced until done)
+
+
+def _drop_web_client(client):
+    """Forget a web client whose socket failed or stalled, and close it.
+
+    Closing makes the browser notice and reconnect, and lets the
+    websocket_handler for this socket run its cleanup.
+    """
+    web_clients.discard(client)
+    _refresh_clients_snapshot()
+    _stop_web_client_writer(web_client_queues.pop(client, None))
+    client_id = _forget_web_client_id(client)
+    if client_id:
+        publish_web_client_offline(client_id)
+    if not client.closed:
+        task = asyncio.ensure_future(client.close(code=WSCloseCode.GOING_AWAY))
+        _closing_clients.add(task)
+        task.add_done_callback(_closing_clients.discard)
+
+
+def _stop_web_client_writer(writer):
+    """Cancel a client's writer task and release any frames still queued."""
+    if writer is None:
         return
+    queue, task = writer
+    if task is not asyncio.current_task():
+        task.cancel()
+    while not queue.empty():
+        queue.get_nowait()
 
-    for client in web_clients.copy():
+
+async def _safe_send(client, message):
+    """Send one message to one client, returning (client, ok)."""
+    try:
+        if isinstance(message, str):
+            await asyncio.wait_for(client.send_str(message), WEB_SEND_TIMEOUT)
+        else:
+            await asyncio.wait_for(client.send_bytes(message), WEB_SEND_TIMEOUT)
+        return client, True
+    except Exception:
+        return client, False
+
+
+async def _web_client_writer(client, queue):
+    """Per-client send loop: drains the client's outbound queue in order."""
+    while True:
+        message = await queue.get()
+        _, ok = await _safe_send(client, message)
+        if not ok:
+            _drop_web_client(client)
+            return
+
+
+def queue_for_web_clients(clients, message):
+    """Queue a message for several web clients (event loop thread only).
+
+    Dict messages are serialized once and sent as text to every client;
+    bytes go out as binary frames.  Each client's writer task does the
+    actual send, so a slow client only delays itself.  When a client's
+    queue is full the oldest entry is dropped — for audio that bounds
+    latency, and for state the newest message supersedes anything older.
+    """
+    if not clients:
+        return
+
+    if isinstance(message, dict):
+        message = _json_dumps(message)
+
+    for client in clients:
+        writer = web_client_queues.get(client)
+        if writer is None or client.closed:
+            continue  # Gone or closing - don't buffer frames for a dead socket
+        queue = writer[0]
         try:
-            if isinstance(message, dict):
-                await client.send_json(message)
-            else:
-                await client.send_bytes(message)
-        except Exception:
-            web_clients.discard(client)
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            queue.put_nowait(message)
+
+
+def broadcast_to_web_clients(message):
+    """Send a message to all connected web clients (event loop thread only)."""
+    if not web_clients:
+        return
+
+    queue_for_web_clients(_clients_snapshot, message)
 
 
-async def broadcast_audio_to_web_clients(pcm_data, priority=PRIORITY_NORMAL):
+def broadcast_audio_to_web_clients(pcm_data, priority=PRIORITY_NORMAL):
     """Send audio PCM data to web clients (targeted based on sender's target).
 
     Prepends a 1-byte priority marker so web clients can apply DND / emergency logic.
@@ -2964,8 +3722,9 @@ async def broadcast_audio_to_web_clients(pcm_data, priority=PRIORITY_NORMAL):
     if not web_clients:
         return
 
-    # Prepend priority byte so the web client can handle it
-    frame = bytes([priority]) + pcm_data
+    # Prepend priority byte so the web client can handle it.  This is the
+    # only copy: the same frame object is queued for every target client.
+    frame = _PRIORITY_PREFIXES[priority] + pcm_data
 
     # Determine target mobile device from the current sender
     target_device = None
@@ -2984,37 +3743,61 @@ async def broadcast_audio_to_web_clients(pcm_data, priority=PRIORITY_NORMAL):
 
     # "all", "All Rooms", or empty target means broadcast to all clients
     if not target_device or target_device.lower() in ("all", "all rooms"):
-        clients_to_send = web_clients.copy()
+        clients_to_send = _clients_snapshot
     else:
-        # Find the web client matching the target
-        target_client = None
-        for client, client_id in list(web_client_ids.items()):
-            if client_id == target_device:
-                target_client = client
-                log.debug(f"Routing audio to web client: {client_id}")
-                break
+        # Find the web client(s) matching the target
+        clients_to_send = web_clients_by_id.get(target_device)
 
         # If target specified but client not connected, don't send to anyone
-        if not target_client:
+        if not clients_to_send:
             log.debug(f"Target {target_device} not connected, dropping audio")
             return
+        log.debug(f"Routing audio to web client: {target_device}")
+
+    queue_for_web_clients(clients_to_send, frame)
 
-        clients_to_send = [target_client]
 
-    for client in clients_to_send:
-        if client is None:
+# Web UI assets preloaded at startup: filename -> (body, content_type, etag).
+# The add-on restarts on update, so the cache never goes stale in practice.
+_static_cache = {}
+
+
+def load_static_cache():
+    """Read every file in WWW_PATH into _static_cache."""
+    if not WWW_PATH.is_dir():
+        log.warning(f"Web UI directory missing: {WWW_PATH}")
+        return
+    for filepath in WWW_PATH.iterdir():
+        if not filepath.is_file():
             continue
-        try:
-            await client.send_bytes(frame)
-        except Exception:
-            web_clients.discard(client)
-            if client in web_client_ids:
-                del web_client_ids[client]
+        body = filepath.read_bytes()
+        content_type = mimetypes.guess_type(filepath.name)[0] or 'application/octet-stream'
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        _static_cache[filepath.name] = (body, content_type, etag)
+    log.info(f"Cached {len(_static_cache)} web UI files")
+
+
+def _cached_static_response(request, filename):
+    """Serve a preloaded asset (304 if the browser's copy is current), or None."""
+    entry = _static_cache.get(filename)
+    if entry is None:
+        return None
+    body, content_type, etag = entry
+    headers = {'ETag': etag}
+    # HTML/JS must revalidate every load so updates are seen
+    if filename.endswith(('.html', '.js')):
+        headers['Cache-Control'] = 'no-cache'
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type=content_type, headers=headers)
 
 
 async def index_handler(request):
     """Serve the main PTT page."""
     log.debug(f"Index request: {request.path}")
+    response = _cached_static_response(request, 'index.html')
+    if response is not None:
+        return response
     response = web.FileResponse(WWW_PATH / 'index.html')
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     return response
@@ -3023,9 +3806,12 @@ async def index_handler(request):
 async def static_handler(request):
     """Serve static files."""
     filename = request.match_info.get('filename', 'index.html')
-    filepath = WWW_PATH / filename
-    log.debug(f"Static request: {request.path} -> {filepath}")
+    log.debug(f"Static request: {request.path}")
+    response = _cached_static_response(request, filename)
+    if response is not None:
+        return response
 
+    filepath = WWW_PATH / filename
     if filepath.exists() and filepath.is_file():
         response = web.FileResponse(filepath)
         # Prevent caching for HTML/JS to ensure updates are seen
@@ -3049,16 +3835,8 @@ SAFE_CHIME_NAME = re.compile(r'^[\w\-]+$')
 
 async def chimes_list_handler(request):
     """GET /api/chimes — list available chimes with metadata."""
-    chimes = []
-    for name, frames in sorted(loaded_chimes.items()):
-        duration = len(frames) * FRAME_DURATION_MS / 1000.0
-        chimes.append({
-            "name": name,
-            "frames": len(frames),
-            "duration": round(duration, 2),
-        })
     return web.json_response({
-        "chimes": chimes,
+        "chimes": _chime_list,
         "current": current_chime,
     })
 
@@ -3082,26 +3860,39 @@ async def chimes_upload_handler(request):
     if not SAFE_CHIME_NAME.match(chime_name):
         return web.json_response({"error": "Invalid filename (use alphanumeric, dashes, underscores)"}, status=400)
 
-    # Read file data with size limit
-    data = bytearray()
-    while True:
-        chunk = await field.read_chunk(8192)
-        if not chunk:
-            break
-        data.extend(chunk)
-        if len(data) > MAX_CHIME_UPLOAD_SIZE:
-            return web.json_response({"error": f"File too large (max {MAX_CHIME_UPLOAD_SIZE // (1024*1024)}MB)"}, status=400)
-
-    if len(data) < 44:  # WAV header is at least 44 bytes
-        return web.json_response({"error": "File too small to be a valid WAV"}, status=400)
-
     # Ensure chimes directory exists
     CHIMES_PATH.mkdir(parents=True, exist_ok=True)
 
-    # Save the WAV file
+    # Stream the upload straight to disk with a size limit; only one chunk
+    # is held in memory.  The partial file is renamed into place when complete.
     dest = CHIMES_PATH / f"{chime_name}.wav"
-    dest.write_bytes(bytes(data))
-    log.info(f"Chime uploaded: '{chime_name}' ({len(data)} bytes) -> {dest}")
+    partial = dest.with_suffix('.wav.part')
+    size = 0
+    try:
+        with open(partial, 'wb') as f:
+            while True:
+                chunk = await field.read_chunk(8192)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_CHIME_UPLOAD_SIZE:
+                    break
+                f.write(chunk)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    if size > MAX_CHIME_UPLOAD_SIZE:
+        partial.unlink(missing_ok=True)
+        return web.json_response({"error": f"File too large (max {MAX_CHIME_UPLOAD_SIZE // (1024*1024)}MB)"}, status=400)
+
+    if size < 44:  # WAV header is at least 44 bytes
+        partial.unlink(missing_ok=True)
+        return web.json_response({"error": "File too small to be a valid WAV"}, status=400)
+
+    # Save the WAV file
+    os.replace(partial, dest)
+    log.info(f"Chime uploaded: '{chime_name}' ({size} bytes) -> {dest}")
 
     # Encode to Opus frames
     frames = load_chime(dest)
@@ -3110,20 +3901,17 @@ async def chimes_upload_handler(request):
         return web.json_response({"error": "Failed to encode WAV (invalid format or codec error)"}, status=400)
 
     loaded_chimes[chime_name] = frames
+    refresh_chime_catalog()
 
     # Update HA select entity with new option
     publish_chime_select()
 
     # Notify all web clients of updated chime list
-    if web_event_loop:
-        asyncio.run_coroutine_threadsafe(
-            broadcast_to_web_clients({
-                'type': 'chimes',
-                'options': get_chime_options(),
-                'current': current_chime
-            }),
-            web_event_loop
-        )
+    broadcast_to_web_clients({
+        'type': 'chimes',
+        'options': get_chime_options(),
+        'current': current_chime
+    })
 
     duration = len(frames) * FRAME_DURATION_MS / 1000.0
     return web.json_response({
@@ -3149,6 +3937,7 @@ async def chimes_delete_handler(request):
 
     # Remove from memory
     del loaded_chimes[name]
+    refresh_chime_catalog()
 
     # Delete WAV file
     wav_file = CHIMES_PATH / f"{name}.wav"
@@ -3170,6 +3959,78 @@ async def chimes_delete_handler(request):
 # Audio RX Stats API
 # =============================================================================
 
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+def is_sender_id_hex(value: str) -> bool:
+    """True if value is 1-16 lowercase hex chars (an 8-byte device_id filter)."""
+    return 0 < len(value) <= 16 and _HEX_DIGITS.issuperset(value)
+
+
+def _json_bytes(payload) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _json_response(payload, status=200):
+    """Build a JSON response, serialized straight to bytes by orjson when available."""
+    return web.Response(body=_json_bytes(payload), status=status, content_type='application/json')
+
+
+# 400 bodies for the audio_stats endpoints, serialized once.  Each request
+# still gets its own Response: aiohttp responses can only be sent once.
+_STATS_ERROR_BODIES = {
+    key: _json_bytes({"error": message})
+    for key, message in (
+        ("window", "Invalid 'window' parameter"),
+        ("sender", "Invalid 'sender' parameter"),
+        ("since", "Invalid 'since' parameter"),
+        ("older_than", "Invalid 'older_than' value — expected a number"),
+    )
+}
+
+
+def _stats_error(key: str):
+    return web.Response(body=_STATS_ERROR_BODIES[key], status=400, content_type='application/json')
+
+
+# Leading '{"current_state":...,"current_sender":...,"senders":' of the GET
+# response, rebuilt only when the (state, sender) pair it was built from changes
+_stats_prefix_key = None
+_stats_prefix = b""
+
+
+def _audio_stats_prefix() -> bytes:
+    global _stats_prefix_key, _stats_prefix
+    key = (current_state, current_audio_sender)
+    if key != _stats_prefix_key:
+        head = _json_bytes({"current_state": key[0], "current_sender": key[1]})
+        _stats_prefix = head[:-1] + b',"senders":'
+        _stats_prefix_key = key
+    return _stats_prefix
+
+
+# Complete GET body for the no-matching-senders case, keyed like the prefix
+# plus the TX counters it embeds
+_stats_idle_key = None
+_stats_idle_body = b""
+
+
+def _audio_stats_idle_body(tx_packets: int, tx_errors: int) -> bytes:
+    global _stats_idle_key, _stats_idle_body
+    key = (current_state, current_audio_sender, tx_packets, tx_errors)
+    if key != _stats_idle_key:
+        _stats_idle_body = _json_bytes({
+            "current_state": key[0],
+            "current_sender": key[1],
+            "senders": {},
+            "tx": {"packets": tx_packets, "errors": tx_errors},
+        })
+        _stats_idle_key = key
+    return _stats_idle_body
+
 async def audio_stats_get_handler(request):
     """GET /api/audio_stats — query per-sender UDP receive statistics.
 
@@ -3198,31 +4059,37 @@ async def audio_stats_get_handler(request):
             }
         }
     """
-    # Auto-reset stuck web PTT state so current_state is accurate
-    _check_web_ptt_timeout()
-
-    # --- Parse query parameters ---
-    try:
-        window = float(request.rel_url.query.get("window", "60"))
-        if window < 0:
-            window = 0.0
-    except (ValueError, TypeError):
-        return web.json_response({"error": "Invalid 'window' parameter"}, status=400)
-
-    sender_filter = request.rel_url.query.get("sender")
-    if sender_filter is not None:
-        # Validate: must be a hex string (up to 16 chars for 8-byte device_id)
-        sender_filter = sender_filter.strip().lower()
-        if not re.fullmatch(r'[0-9a-f]{1,16}', sender_filter):
-            return web.json_response({"error": "Invalid 'sender' parameter"}, status=400)
-
+    # --- Parse query parameters (plain polls send none) ---
+    window = 60.0
+    sender_filter = None
     since_filter = None
-    since_raw = request.rel_url.query.get("since")
-    if since_raw is not None:
-        try:
-            since_filter = float(since_raw)
-        except (ValueError, TypeError):
-            return web.json_response({"error": "Invalid 'since' parameter"}, status=400)
+    # Check the raw string first: building the parsed MultiDict is the
+    # expensive part, and yarl caches it for the three lookups below
+    if request.rel_url.raw_query_string:
+        query = request.rel_url.query
+        window_raw = query.get("window")
+        if window_raw is not None:
+            if window_raw.isascii() and window_raw.isdigit():  # Common case: whole seconds
+                window = float(window_raw)
+            else:
+                try:
+                    window = max(0.0, float(window_raw))
+                except (ValueError, TypeError):
+                    return _stats_error("window")
+
+        sender_filter = query.get("sender")
+        if sender_filter is not None:
+            # Validate: must be a hex string (up to 16 chars for 8-byte device_id)
+            sender_filter = sender_filter.strip().lower()
+            if not is_sender_id_hex(sender_filter):
+                return _stats_error("sender")
+
+        since_raw = query.get("since")
+        if since_raw is not None:
+            try:
+                since_filter = float(since_raw)
+            except (ValueError, TypeError):
+                return _stats_error("since")
 
     # --- Build response ---
     senders = audio_rx_stats.get_stats(
@@ -3231,15 +4098,23 @@ async def audio_stats_get_handler(request):
         since=since_filter,
     )
 
-    return web.json_response({
-        "current_state": current_state,
-        "current_sender": current_audio_sender,
-        "senders": senders,
-        "tx": {
-            "packets": mcast_metrics.tx_packets,
-            "errors": mcast_metrics.tx_errors,
-        },
-    })
+    tx_packets = mcast_metrics.tx_packets
+    tx_errors = mcast_metrics.tx_errors
+
+    # Idle system: nothing matched, so the whole body depends only on
+    # state/sender/TX counters - reuse it until one of them changes
+    if not senders:
+        return web.Response(body=_audio_stats_idle_body(tx_packets, tx_errors), content_type='application/json')
+
+    # Only the senders map and TX counters are serialized per request
+    body = b"".join((
+        _audio_stats_prefix(),
+        _json_bytes(senders),
+        b',"tx":',
+        _json_bytes({"packets": tx_packets, "errors": tx_errors}),
+        b"}",
+    ))
+    return web.Response(body=body, content_type='application/json')
 
 
 async def audio_stats_post_handler(request):
@@ -3256,8 +4131,14 @@ async def audio_stats_post_handler(request):
     older_than: float = 0.0
 
     # Body is optional — ignore missing / non-JSON body and treat as clear-all.
+    # A small body with a Content-Length is read in one exact-size read.
     try:
-        body = await request.json()
+        length = request.content_length
+        if length is not None and length <= MAX_MESSAGE_LENGTH:
+            raw = await request.content.readexactly(length) if length else b""
+        else:
+            raw = await request.read()
+        body = _json_loads(raw) if raw else {}
     except Exception:
         body = {}
 
@@ -3265,17 +4146,14 @@ async def audio_stats_post_handler(request):
         try:
             older_than = max(0.0, float(body["older_than"]))
         except (ValueError, TypeError):
-            return web.json_response(
-                {"error": "Invalid 'older_than' value — expected a number"},
-                status=400,
-            )
+            return _stats_error("older_than")
 
     cleared = audio_rx_stats.clear(older_than=older_than)
     # Also reset TX counters
     with mcast_metrics._lock:
         mcast_metrics.tx_packets = 0
         mcast_metrics.tx_errors = 0
-    return web.json_response({"result": "ok", "cleared": cleared})
+    return _json_response({"result": "ok", "cleared": cleared})
 
 
 async def audio_capture_get_handler(request):
@@ -3357,6 +4235,13 @@ def create_web_app():
     return app
 
 
+async def _web_ptt_timeout_loop():
+    """Periodically auto-reset a web PTT session that stopped sending audio."""
+    while True:
+        await asyncio.sleep(0.25)
+        _check_web_ptt_timeout()
+
+
 async def run_web_server():
     """Run the web server for ingress."""
     global web_event_loop, web_tx_lock
@@ -3371,8 +4256,18 @@ async def run_web_server():
     # Create async lock for serializing web PTT transmissions
     web_tx_lock = asyncio.Lock()
 
+    # Reset stuck web PTT state in the background so status readers
+    # (e.g. /api/audio_stats polling) don't each run the check
+    timeout_task = asyncio.create_task(_web_ptt_timeout_loop())
+
+    load_static_cache()
+
     app = create_web_app()
-    runner = web.AppRunner(app)
+    # Per-request access logging only at debug level - the UI polls the API
+    if LOG_LEVEL == 'DEBUG':
+        runner = web.AppRunner(app)
+    else:
+        runner = web.AppRunner(app, access_log=None)
     await runner.setup()
 
     site = web.TCPSite(runner, '0.0.0.0', INGRESS_PORT)
@@ -3380,9 +4275,18 @@ async def run_web_server():
 
     log.info(f"Web PTT server running on port {INGRESS_PORT}")
 
-    # Keep running
-    while True:
-        await asyncio.sleep(3600)
+    # Run until the Supervisor stops the add-on (SIGTERM) or Ctrl+C
+    shutdown = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            web_event_loop.add_signal_handler(sig, shutdown.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # No loop signal support - KeyboardInterrupt still ends main()
+    await shutdown.wait()
+
+    log.info("Shutting down web server...")
+    timeout_task.cancel()
+    await runner.cleanup()
 
 
 def run_mqtt_loop():
@@ -3455,7 +4359,16 @@ def main():
     log.info("Intercom Hub running...")
     if web is not None:
         try:
-            asyncio.run(run_web_server())
+            if uvloop is not None:
+                log.info("Using uvloop event loop")
+                if hasattr(uvloop, "run"):
+                    uvloop.run(run_web_server())
+                else:
+                    # uvloop < 0.18 (Alpine's py3-uvloop) predates uvloop.run()
+                    uvloop.install()
+                    asyncio.run(run_web_server())
+            else:
+                asyncio.run(run_web_server())
         except KeyboardInterrupt:
             log.info("Shutting down...")
     else:
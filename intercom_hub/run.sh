@@ -29,6 +29,13 @@ else
   export LOG_LEVEL="info"
 fi
 
+# Web PTT Opus mode (low delay = CELT-only)
+if bashio::config.exists 'web_ptt_low_delay'; then
+  export WEB_PTT_LOW_DELAY=$(bashio::config 'web_ptt_low_delay')
+else
+  export WEB_PTT_LOW_DELAY="true"
+fi
+
 echo "Starting Intercom Hub..."
 echo "MQTT: ${MQTT_HOST}:${MQTT_PORT}"
 echo "Multicast: ${MULTICAST_GROUP}:${MULTICAST_PORT}"
@@ -0,0 +1,81 @@
+"""Limits on in-process (PyAV) media decode.
+
+Run from the add-on directory: python -m unittest discover -s tests
+"""
+
+import itertools
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intercom_hub  # noqa: E402
+
+
+class _FakeFrame:
+    """Stands in for a resampled av.AudioFrame: 20ms of s16 mono silence."""
+
+    samples = intercom_hub.FRAME_SIZE
+    planes = [bytes(intercom_hub.FRAME_SIZE * 2)]
+
+
+class _FakeContainer:
+    """An endless live stream: decode() never runs out of frames."""
+
+    def __init__(self):
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+    def decode(self, audio=0):
+        return itertools.repeat(object())
+
+
+class _FakeResampler:
+    def __init__(self, **kwargs):
+        pass
+
+    def resample(self, frame):
+        return [_FakeFrame()] if frame is not None else []
+
+
+class PyAVDecodeLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.container = _FakeContainer()
+        fake_av = mock.Mock()
+        fake_av.open.return_value = self.container
+        fake_av.AudioResampler = _FakeResampler
+        patcher = mock.patch.object(intercom_hub, "av", fake_av)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_endless_stream_stops_at_size_cap(self):
+        with mock.patch.object(intercom_hub, "MEDIA_MAX_PCM_BYTES", 100 * intercom_hub.FRAME_SIZE * 2):
+            with self.assertRaises(intercom_hub.MediaDecodeLimitError):
+                intercom_hub._decode_url_with_pyav("http://radio.example/stream")
+        self.assertTrue(self.container.closed)
+
+    def test_endless_stream_stops_at_deadline(self):
+        with mock.patch.object(intercom_hub, "MEDIA_DECODE_TIMEOUT", 0.05), \
+                mock.patch.object(intercom_hub, "MEDIA_MAX_PCM_BYTES", float("inf")):
+            with self.assertRaises(intercom_hub.MediaDecodeLimitError):
+                intercom_hub._decode_url_with_pyav("http://radio.example/live.m3u8")
+        self.assertTrue(self.container.closed)
+
+    def test_fetch_does_not_fall_back_to_ffmpeg_after_limit(self):
+        with mock.patch.object(intercom_hub, "MEDIA_DECODE_TIMEOUT", 0.05), \
+                mock.patch.object(intercom_hub.subprocess, "run") as run:
+            self.assertIsNone(intercom_hub.fetch_and_convert_audio("http://radio.example/stream"))
+        run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()